@@ -1,5 +1,6 @@
 """Anomaly detection module for FinOpsMind ML sidecar."""
 
-from .isolation_forest import CostAnomalyDetector, detect_anomalies
+from .isolation_forest import CostAnomalyDetector, detect_anomalies, detect_anomalies_arrays
+from .service import AnomalyDetectionService
 
-__all__ = ['CostAnomalyDetector', 'detect_anomalies']
+__all__ = ['CostAnomalyDetector', 'detect_anomalies', 'detect_anomalies_arrays', 'AnomalyDetectionService']
@@ -5,20 +5,77 @@ Detects cost anomalies and identifies root causes.
 
 import logging
 from datetime import datetime
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Optional, Tuple, Union
 import numpy as np
 import pandas as pd
 
 try:
     from sklearn.ensemble import IsolationForest
-    from sklearn.preprocessing import StandardScaler
+    from scipy.special import expit
+    try:
+        from joblib import parallel_config
+    except ImportError:  # joblib < 1.3
+        from joblib import parallel_backend as parallel_config
     SKLEARN_AVAILABLE = True
 except ImportError:
     SKLEARN_AVAILABLE = False
     logging.warning("scikit-learn not installed. Using fallback anomaly detection.")
 
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
+# Cost records, either one dict per point or a mapping of column name to array
+CostData = Union[List[Dict], Dict[str, np.ndarray]]
+
+
+def _iqr_scores_numpy(
+    costs: np.ndarray,
+    lower_bound: float,
+    upper_bound: float,
+    scale: float,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Score costs by their distance outside the IQR fences.
+    
+    Returns:
+        Tuple of (anomaly mask, score capped at 1.0)
+    """
+    upper_mask = costs > upper_bound
+    lower_mask = costs < lower_bound
+    deviation = np.where(
+        upper_mask,
+        (costs - upper_bound) / scale,
+        np.where(lower_mask, (lower_bound - costs) / scale, 0.0),
+    )
+    return upper_mask | lower_mask, np.minimum(1.0, deviation / 3)
+
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True)
+    def _iqr_scores(costs, lower_bound, upper_bound, scale):
+        """Single-pass compiled equivalent of `_iqr_scores_numpy`."""
+        n = costs.shape[0]
+        anomaly_mask = np.zeros(n, dtype=np.bool_)
+        scores = np.zeros(n, dtype=np.float64)
+        for i in range(n):
+            cost = costs[i]
+            if cost > upper_bound:
+                deviation = (cost - upper_bound) / scale
+            elif cost < lower_bound:
+                deviation = (lower_bound - cost) / scale
+            else:
+                continue
+            anomaly_mask[i] = True
+            scores[i] = min(1.0, deviation / 3)
+        return anomaly_mask, scores
+else:
+    _iqr_scores = _iqr_scores_numpy
+
 
 class CostAnomalyDetector:
     """
@@ -48,27 +105,40 @@ class CostAnomalyDetector:
         self.random_state = random_state
         
         self.model: Optional[IsolationForest] = None
-        self.scaler: Optional[StandardScaler] = None
         self._is_fitted = False
         self._feature_names: List[str] = []
         self._training_stats: Dict = {}
         
     def _prepare_features(
         self,
-        cost_data: List[Dict],
+        cost_data: CostData,
         include_services: bool = True
     ) -> Tuple[pd.DataFrame, pd.DataFrame]:
         """
         Extract features from cost time series data.
         
         Args:
-            cost_data: List of cost records with date, cost, and optional service breakdown
+            cost_data: List of cost records with date, cost, and optional service
+                breakdown, or the same fields as a mapping of column name to array
             include_services: Whether to include per-service costs as features
             
         Returns:
             Tuple of (features DataFrame, original data DataFrame)
         """
+        features, df, _ = self._prepare_ordered(cost_data, include_services)
+        return features, df
+    
+    def _prepare_ordered(
+        self,
+        cost_data: CostData,
+        include_services: bool = True
+    ) -> Tuple[pd.DataFrame, pd.DataFrame, np.ndarray]:
+        """
+        Same as `_prepare_features`, plus the input position of each row
+        after sorting by date.
+        """
         df = pd.DataFrame(cost_data)
+        order = np.arange(len(df))
         
         # Handle date column
         date_col = None
@@ -79,7 +149,9 @@ class CostAnomalyDetector:
         
         if date_col:
             df['date'] = pd.to_datetime(df[date_col])
-            df = df.sort_values('date').reset_index(drop=True)
+            df = df.sort_values('date', kind='stable')
+            order = df.index.to_numpy()
+            df = df.reset_index(drop=True)
         
         # Get cost column
         cost_col = None
@@ -93,30 +165,42 @@ class CostAnomalyDetector:
         
         df['total_cost'] = df[cost_col].astype(float)
         
-        # Build feature set
-        features = pd.DataFrame()
+        # Build feature set as plain arrays and wrap them in a DataFrame once,
+        # rather than paying for alignment on every column assignment
+        cost_series = df['total_cost']
+        costs = cost_series.to_numpy()
+        n = len(costs)
         
         # Basic cost features
-        features['total_cost'] = df['total_cost']
+        feat: Dict[str, np.ndarray] = {'total_cost': costs}
         
         # Rolling statistics (if enough data)
-        if len(df) >= 7:
-            features['rolling_mean_7d'] = df['total_cost'].rolling(7, min_periods=1).mean()
-            features['rolling_std_7d'] = df['total_cost'].rolling(7, min_periods=1).std().fillna(0)
-            features['cost_vs_rolling_mean'] = features['total_cost'] - features['rolling_mean_7d']
+        if n >= 7:
+            rolling = cost_series.rolling(7, min_periods=1)
+            rolling_mean = rolling.mean().to_numpy()
+            rolling_std = rolling.std().fillna(0).to_numpy()
         else:
-            features['rolling_mean_7d'] = df['total_cost'].mean()
-            features['rolling_std_7d'] = df['total_cost'].std() if len(df) > 1 else 0
-            features['cost_vs_rolling_mean'] = features['total_cost'] - features['rolling_mean_7d']
+            rolling_mean = np.full(n, cost_series.mean())
+            rolling_std = np.full(n, cost_series.std() if n > 1 else 0.0)
+        feat['rolling_mean_7d'] = rolling_mean
+        feat['rolling_std_7d'] = rolling_std
+        feat['cost_vs_rolling_mean'] = costs - rolling_mean
         
         # Day of week effect
         if 'date' in df.columns:
-            features['day_of_week'] = df['date'].dt.dayofweek
-            features['is_weekend'] = (features['day_of_week'] >= 5).astype(int)
-        
-        # Day-over-day change
-        features['cost_change'] = df['total_cost'].diff().fillna(0)
-        features['cost_change_pct'] = df['total_cost'].pct_change().fillna(0).replace([np.inf, -np.inf], 0)
+            day_of_week = df['date'].dt.dayofweek.to_numpy()
+            feat['day_of_week'] = day_of_week
+            feat['is_weekend'] = (day_of_week >= 5).astype(int)
+        
+        # Day-over-day change; percent change is 0 where the previous day was 0
+        prev = costs[:-1]
+        cost_change = np.zeros_like(costs)
+        cost_change[1:] = costs[1:] - prev
+        cost_change_pct = np.zeros_like(costs)
+        nonzero = prev != 0
+        cost_change_pct[1:][nonzero] = costs[1:][nonzero] / prev[nonzero] - 1
+        feat['cost_change'] = cost_change
+        feat['cost_change_pct'] = cost_change_pct
         
         # Service-level features if available
         service_cols = [col for col in df.columns if col.startswith('service_') or col in [
@@ -124,15 +208,19 @@ class CostAnomalyDetector:
         ]]
         
         if include_services and service_cols:
-            for col in service_cols:
-                features[f'svc_{col}'] = df[col].astype(float)
+            # One block conversion for all services instead of a cast per column
+            svc_block = df[service_cols].to_numpy(dtype=np.float64)
+            for j, col in enumerate(service_cols):
+                feat[f'svc_{col}'] = svc_block[:, j]
+        
+        features = pd.DataFrame(feat, copy=False)
         
         # Store feature names
         self._feature_names = features.columns.tolist()
         
-        return features, df
+        return features, df, order
     
-    def fit(self, cost_data: List[Dict]) -> 'CostAnomalyDetector':
+    def fit(self, cost_data: CostData) -> 'CostAnomalyDetector':
         """
         Train the anomaly detection model on historical cost data.
         
@@ -143,17 +231,23 @@ class CostAnomalyDetector:
             self for method chaining
         """
         features, df = self._prepare_features(cost_data)
-        
+        return self._fit_prepared(features, df)
+    
+    def _fit_prepared(self, features: pd.DataFrame, df: pd.DataFrame) -> 'CostAnomalyDetector':
+        """Train on features already built by `_prepare_features`."""
         if len(features) < 14:
             raise ValueError("Need at least 14 days of data for reliable anomaly detection")
         
-        # Store training statistics for root cause analysis
+        # Store training statistics for root cause analysis; the three
+        # quantiles come from a single partition of the cost array
+        costs = df['total_cost'].to_numpy()
+        q1, median, q3 = np.percentile(costs, [25, 50, 75])
         self._training_stats = {
-            'mean_cost': df['total_cost'].mean(),
-            'std_cost': df['total_cost'].std(),
-            'median_cost': df['total_cost'].median(),
-            'q1': df['total_cost'].quantile(0.25),
-            'q3': df['total_cost'].quantile(0.75),
+            'mean_cost': costs.mean(),
+            'std_cost': costs.std(ddof=1),
+            'median_cost': median,
+            'q1': q1,
+            'q3': q3,
         }
         
         if not SKLEARN_AVAILABLE:
@@ -162,9 +256,12 @@ class CostAnomalyDetector:
             self._is_fitted = True
             return self
         
-        # Scale features
-        self.scaler = StandardScaler()
-        scaled_features = self.scaler.fit_transform(features)
+        # Isolation Forest picks split thresholds uniformly between each
+        # feature's min and max, so per-feature scaling does not change the
+        # partitions and the raw features are used directly. The trees store
+        # thresholds as float32 and cast their input on every call, so hand
+        # them float32 up front.
+        feature_matrix = features.to_numpy(dtype=np.float32)
         
         # Train Isolation Forest
         self.model = IsolationForest(
@@ -176,14 +273,14 @@ class CostAnomalyDetector:
         )
         
         logger.info(f"Training Isolation Forest on {len(features)} data points")
-        self.model.fit(scaled_features)
+        self.model.fit(feature_matrix)
         self._is_fitted = True
         
         return self
     
     def detect(
         self,
-        cost_data: List[Dict],
+        cost_data: CostData,
         return_scores: bool = True
     ) -> Dict:
         """
@@ -200,49 +297,74 @@ class CostAnomalyDetector:
             raise RuntimeError("Model must be fitted before detection")
         
         features, df = self._prepare_features(cost_data)
-        
+        return self._detect_prepared(features, df, return_scores)
+    
+    def _detect_prepared(
+        self,
+        features: pd.DataFrame,
+        df: pd.DataFrame,
+        return_scores: bool = True
+    ) -> Dict:
+        """Detect anomalies on features already built by `_prepare_features`."""
         if not SKLEARN_AVAILABLE:
             return self._fallback_detect(features, df)
         
-        # Scale features
-        scaled_features = self.scaler.transform(features)
+        feature_matrix = features.to_numpy(dtype=np.float32)
+        
+        # Tree traversal is read-only over shared arrays, so score with
+        # threads rather than processes (n_jobs on the model only covers fit)
+        with parallel_config(backend='threading', n_jobs=-1):
+            raw_scores = self.model.score_samples(feature_matrix)
         
-        # Get predictions (-1 for anomaly, 1 for normal)
-        predictions = self.model.predict(scaled_features)
+        # Get anomaly scores (more negative = more anomalous); this is what
+        # decision_function returns, without a second pass over the trees
+        scores = raw_scores - self.model.offset_
         
-        # Get anomaly scores (more negative = more anomalous)
-        scores = self.model.decision_function(scaled_features)
+        # Get predictions (-1 for anomaly, 1 for normal), as predict() does
+        predictions = np.where(scores < 0, -1, 1)
         
         # Convert scores to probability-like values (0-1, higher = more anomalous)
         # Normalize: score < 0 means anomaly, transform to probability
-        anomaly_probs = 1 / (1 + np.exp(scores * 5))  # Sigmoid transformation
+        anomaly_probs = expit(-5.0 * scores.astype(np.float32))  # Sigmoid, single pass
         
-        # Build results
-        anomalies = []
-        all_results = []
+        # Extract columns once; per-row iloc lookups dominate for long series
+        date_strs = self._date_strings(df)
+        cost_arr = df['total_cost'].to_numpy(dtype=float)
+        feat_array = features.to_numpy(dtype=float)
         
-        for i in range(len(df)):
-            is_anomaly = predictions[i] == -1
+        def build_record(i: int) -> Dict:
             score = float(anomaly_probs[i])
-            
-            record = {
-                'date': df.iloc[i]['date'].strftime('%Y-%m-%d') if 'date' in df.columns else f"point_{i}",
-                'cost': float(df.iloc[i]['total_cost']),
-                'is_anomaly': is_anomaly,
+            return {
+                'date': date_strs[i],
+                'cost': float(cost_arr[i]),
+                'is_anomaly': bool(predictions[i] == -1),
                 'anomaly_score': round(score, 4),
                 'severity': self._classify_severity(score),
             }
+        
+        # Build results; per-point records are only materialized if returned
+        all_results = [build_record(i) for i in range(len(df))] if return_scores else None
+        
+        # Root cause analysis only touches the anomalous rows; the top
+        # service for each of them is found in one argmax over the block
+        anomalies = []
+        anom_idx = np.flatnonzero(predictions == -1)
+        if anom_idx.size:
+            svc_pos = [j for j, name in enumerate(self._feature_names) if name.startswith('svc_')]
+            top_services = [None] * anom_idx.size
+            if svc_pos:
+                top_pos = feat_array[np.ix_(anom_idx, svc_pos)].argmax(axis=1)
+                top_services = [
+                    self._service_name(self._feature_names[svc_pos[k]]) for k in top_pos
+                ]
             
-            if is_anomaly:
-                # Identify root cause
+            for i, top_service in zip(anom_idx, top_services):
+                record = all_results[i] if all_results is not None else build_record(i)
                 record['root_cause'] = self._identify_root_cause(
-                    features.iloc[i],
-                    df.iloc[i] if i < len(df) else None
+                    dict(zip(self._feature_names, feat_array[i])),
+                    top_service,
                 )
                 anomalies.append(record)
-            
-            if return_scores:
-                all_results.append(record)
         
         return {
             'detection_timestamp': datetime.utcnow().isoformat(),
@@ -250,7 +372,7 @@ class CostAnomalyDetector:
             'anomalies_detected': len(anomalies),
             'anomaly_rate': round(len(anomalies) / len(df), 4) if df.shape[0] > 0 else 0,
             'anomalies': anomalies,
-            'all_results': all_results if return_scores else None,
+            'all_results': all_results,
             'thresholds': {
                 'contamination': self.contamination,
                 'severity_levels': {
@@ -271,43 +393,35 @@ class CostAnomalyDetector:
         lower_bound = stats['q1'] - 1.5 * iqr
         upper_bound = stats['q3'] + 1.5 * iqr
         
-        anomalies = []
-        all_results = []
+        # Distance outside the IQR fences, normalized by the IQR and
+        # converted to a probability-like score capped at 1.0
+        costs = df['total_cost'].to_numpy(dtype=float)
+        anomaly_mask, scores = _iqr_scores(
+            costs, float(lower_bound), float(upper_bound), float(iqr if iqr > 0 else 1)
+        )
         
-        for i in range(len(df)):
-            cost = float(df.iloc[i]['total_cost'])
-            
-            # Calculate how far outside bounds (normalized)
-            if cost > upper_bound:
-                deviation = (cost - upper_bound) / (iqr if iqr > 0 else 1)
-                is_anomaly = True
-            elif cost < lower_bound:
-                deviation = (lower_bound - cost) / (iqr if iqr > 0 else 1)
-                is_anomaly = True
-            else:
-                deviation = 0
-                is_anomaly = False
-            
-            # Convert to probability-like score
-            score = min(1.0, deviation / 3)  # Cap at 1.0
-            
-            record = {
-                'date': df.iloc[i]['date'].strftime('%Y-%m-%d') if 'date' in df.columns else f"point_{i}",
+        all_results = []
+        for date_str, cost, is_anomaly, score in zip(
+            self._date_strings(df), costs.tolist(), anomaly_mask.tolist(), scores.tolist()
+        ):
+            all_results.append({
+                'date': date_str,
                 'cost': cost,
                 'is_anomaly': is_anomaly,
                 'anomaly_score': round(score, 4),
                 'severity': self._classify_severity(score),
+            })
+        
+        anomalies = []
+        for i in np.flatnonzero(anomaly_mask):
+            record = all_results[i]
+            cost = record['cost']
+            record['root_cause'] = {
+                'primary_factor': 'cost_spike' if cost > stats['mean_cost'] else 'cost_drop',
+                'deviation_from_median': round(cost - stats['median_cost'], 2),
+                'percentage_deviation': round((cost - stats['mean_cost']) / stats['mean_cost'] * 100, 2) if stats['mean_cost'] > 0 else 0,
             }
-            
-            if is_anomaly:
-                record['root_cause'] = {
-                    'primary_factor': 'cost_spike' if cost > stats['mean_cost'] else 'cost_drop',
-                    'deviation_from_median': round(cost - stats['median_cost'], 2),
-                    'percentage_deviation': round((cost - stats['mean_cost']) / stats['mean_cost'] * 100, 2) if stats['mean_cost'] > 0 else 0,
-                }
-                anomalies.append(record)
-            
-            all_results.append(record)
+            anomalies.append(record)
         
         return {
             'detection_timestamp': datetime.utcnow().isoformat(),
@@ -324,6 +438,13 @@ class CostAnomalyDetector:
             'note': 'Using IQR fallback method (scikit-learn not available)'
         }
     
+    @staticmethod
+    def _date_strings(df: pd.DataFrame) -> List[str]:
+        """Format the date column once for all rows (``point_<i>`` if absent)."""
+        if 'date' in df.columns:
+            return df['date'].dt.strftime('%Y-%m-%d').tolist()
+        return [f"point_{i}" for i in range(len(df))]
+    
     def _classify_severity(self, score: float) -> str:
         """Classify anomaly severity based on score."""
         if score >= 0.9:
@@ -335,13 +456,22 @@ class CostAnomalyDetector:
         else:
             return 'low'
     
+    @staticmethod
+    def _service_name(feature_name: str) -> str:
+        """Map a ``svc_*`` feature column back to its service name."""
+        return feature_name.replace('svc_', '').replace('service_', '')
+    
     def _identify_root_cause(
         self,
-        features: pd.Series,
-        original_record: Optional[pd.Series]
+        features: Dict[str, float],
+        top_service: Optional[str] = None
     ) -> Dict:
         """
         Attempt to identify the root cause of an anomaly.
+        
+        Args:
+            features: Feature name -> value mapping for the anomalous point
+            top_service: Highest-cost service, if already computed by the caller
         """
         root_cause = {
             'primary_factor': 'unknown',
@@ -371,22 +501,25 @@ class CostAnomalyDetector:
             root_cause['contributing_factors'].append('Weekend traffic pattern')
         
         # Check service-level contributions
-        service_features = [f for f in features.index if f.startswith('svc_')]
-        if service_features and original_record is not None:
+        service_features = [f for f in features if f.startswith('svc_')]
+        if service_features:
             service_costs = {}
             for sf in service_features:
-                service_name = sf.replace('svc_', '').replace('service_', '')
-                if sf in features:
-                    service_costs[service_name] = features[sf]
+                service_costs[self._service_name(sf)] = features[sf]
             
             if service_costs:
+                names = list(service_costs.keys())
+                vals = np.fromiter(service_costs.values(), dtype=np.float64, count=len(names))
+                
                 # Find top contributing service
-                top_service = max(service_costs.items(), key=lambda x: x[1])
-                root_cause['contributing_factors'].append(f'Highest cost service: {top_service[0]}')
+                if top_service is None:
+                    top_service = names[int(vals.argmax())]
+                root_cause['contributing_factors'].append(f'Highest cost service: {top_service}')
+                
+                # Five largest; the stable sort keeps tied services in input order
+                top_idx = np.argsort(-vals, kind='stable')[:5]
                 root_cause['details']['service_breakdown'] = {
-                    k: round(v, 2) for k, v in sorted(
-                        service_costs.items(), key=lambda x: x[1], reverse=True
-                    )[:5]
+                    names[j]: round(vals[j], 2) for j in top_idx
                 }
         
         # Calculate percentage over baseline
@@ -411,8 +544,8 @@ class CostAnomalyDetector:
 
 
 def detect_anomalies(
-    cost_data: List[Dict],
-    training_data: Optional[List[Dict]] = None,
+    cost_data: CostData,
+    training_data: Optional[CostData] = None,
     contamination: float = 0.1,
 ) -> Dict:
     """
@@ -431,10 +564,58 @@ def detect_anomalies(
     # Use training_data if provided, otherwise use first 80% of cost_data
     if training_data:
         detector.fit(training_data)
-    elif len(cost_data) >= 20:
-        split_idx = int(len(cost_data) * 0.8)
-        detector.fit(cost_data[:split_idx])
+        return detector.detect(cost_data)
+    
+    features, df, order = detector._prepare_ordered(cost_data)
+    if len(df) >= 20:
+        split_idx = int(len(df) * 0.8)
+        if order[:split_idx].max() >= split_idx:
+            # The first 80% as given are not the earliest 80% by date, so
+            # their features have to be built on their own
+            detector.fit(_head(cost_data, split_idx))
+            return detector.detect(cost_data)
+        # Rolling/diff features of a date-ordered prefix are the prefix of
+        # the full feature set, so the training slice is taken from it
+        detector._fit_prepared(features.iloc[:split_idx], df.iloc[:split_idx])
     else:
-        detector.fit(cost_data)
+        detector._fit_prepared(features, df)
     
-    return detector.detect(cost_data)
+    return detector._detect_prepared(features, df)
+
+
+def _head(cost_data: CostData, n: int) -> CostData:
+    """First ``n`` cost records, in input order."""
+    if isinstance(cost_data, dict):
+        return {col: values[:n] for col, values in cost_data.items()}
+    return cost_data[:n]
+
+
+def detect_anomalies_arrays(
+    dates: np.ndarray,
+    costs: np.ndarray,
+    service_costs: Optional[Dict[str, np.ndarray]] = None,
+    training_data: Optional[CostData] = None,
+    contamination: float = 0.1,
+) -> Dict:
+    """
+    Detect anomalies from parallel date and cost arrays.
+    
+    Same as `detect_anomalies`, but the input is handed to pandas as
+    columns instead of one dict per day.
+    
+    Args:
+        dates: datetime64 array of observation dates
+        costs: float array of daily costs, aligned with ``dates``
+        service_costs: Optional per-service cost arrays, aligned with ``dates``
+        training_data: Historical data to train on (if different from the input)
+        contamination: Expected proportion of anomalies
+        
+    Returns:
+        Anomaly detection results
+    """
+    cost_data = {'date': dates, 'cost': costs, **(service_costs or {})}
+    return detect_anomalies(
+        cost_data=cost_data,
+        training_data=training_data,
+        contamination=contamination,
+    )
@@ -0,0 +1,169 @@
+"""
+Organization-level anomaly detection service for the /api/v1 endpoints.
+Uses a cost-only Isolation Forest when scikit-learn is installed,
+otherwise a global z-score test.
+"""
+
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Sequence
+import numpy as np
+
+from points import cost_array
+
+try:
+    from sklearn.ensemble import IsolationForest
+    SKLEARN_AVAILABLE = True
+except ImportError:
+    SKLEARN_AVAILABLE = False
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# Series at least this long build their isolation trees on all cores
+PARALLEL_FIT_MIN_POINTS = 2048
+
+# Fitted forests kept for re-queried series
+MODEL_CACHE_SIZE = 32
+
+
+def _zscore_core_numpy(amounts, mean, std, threshold):
+    """Absolute z-score of every amount and the mask of those above threshold."""
+    z_scores = np.abs((amounts - mean) / std) if std > 0 else np.zeros_like(amounts)
+    return z_scores > threshold, z_scores
+
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True)
+    def _zscore_core(amounts, mean, std, threshold):
+        """Single-pass compiled equivalent of `_zscore_core_numpy`."""
+        n = amounts.shape[0]
+        mask = np.zeros(n, dtype=np.bool_)
+        z_scores = np.zeros(n, dtype=np.float64)
+        for i in range(n):
+            z = abs((amounts[i] - mean) / std) if std > 0 else 0.0
+            z_scores[i] = z
+            mask[i] = z > threshold
+        return mask, z_scores
+else:
+    _zscore_core = _zscore_core_numpy
+
+
+class AnomalyDetectionService:
+    """
+    Flags anomalous days in a series of ``{date, cost}`` points.
+
+    Anomalies are returned as ``{date, actual_amount, expected_amount,
+    deviation, deviation_pct, score, severity}`` dicts.
+    """
+
+    def __init__(self):
+        self.model_version = "isolation-forest-1.0" if SKLEARN_AVAILABLE else "z-score-1.0"
+        self._models = OrderedDict()
+        self._models_lock = threading.Lock()
+
+    def detect(self, data: Sequence, sensitivity: float) -> List[Dict]:
+        """
+        Detect anomalous points.
+
+        Args:
+            data: Points to analyze, oldest first
+            sensitivity: Expected proportion of anomalies
+        """
+        if len(data) < 14:
+            raise ValueError("Need at least 14 data points")
+
+        if SKLEARN_AVAILABLE:
+            return self._isolation_forest_detect(data, sensitivity)
+        return self._zscore_detect(data, sensitivity)
+
+    def _isolation_forest_detect(self, data, sensitivity):
+        # The forest thresholds in float32 and would otherwise cast a copy
+        amounts = cost_array(data, dtype=np.float32).reshape(-1, 1)
+        model = self._fitted_forest(amounts, sensitivity)
+
+        # One pass over the trees; decision_function and predict both derive
+        # from score_samples shifted by the fitted offset
+        scores = model.score_samples(amounts) - model.offset_
+        predictions = np.where(scores < 0, -1, 1)
+        scores_normalized = (scores - scores.min()) / (scores.max() - scores.min() + 1e-10)
+
+        anomalies = []
+        mean_amount = np.mean(amounts, dtype=np.float64)
+
+        for i, (pred, score) in enumerate(zip(predictions, scores_normalized)):
+            if pred == -1:
+                actual = data[i].cost
+                deviation = actual - mean_amount
+                deviation_pct = (deviation / mean_amount) * 100 if mean_amount > 0 else 0
+                anomalies.append({
+                    "date": data[i].date,
+                    "actual_amount": actual,
+                    "expected_amount": round(float(mean_amount), 2),
+                    "deviation": round(deviation, 2),
+                    "deviation_pct": round(deviation_pct, 2),
+                    "score": round(1 - score, 4),
+                    "severity": self._classify_severity(abs(deviation_pct)),
+                })
+        return anomalies
+
+    def _fitted_forest(self, amounts, sensitivity):
+        """Return a forest fitted on ``amounts``, reusing one fitted on the same series."""
+        digest = hashlib.blake2b(amounts.tobytes(), digest_size=16)
+        digest.update(repr(sensitivity).encode())
+        key = digest.hexdigest()
+
+        with self._models_lock:
+            model = self._models.get(key)
+            if model is not None:
+                self._models.move_to_end(key)
+                return model
+
+        # Tree seeds are drawn up front from random_state, so the forest is the
+        # same whether its trees are built serially or in parallel
+        n_jobs = -1 if len(amounts) >= PARALLEL_FIT_MIN_POINTS else None
+        model = IsolationForest(contamination=sensitivity, random_state=42, n_jobs=n_jobs)
+        model.fit(amounts)
+
+        with self._models_lock:
+            self._models[key] = model
+            if len(self._models) > MODEL_CACHE_SIZE:
+                self._models.popitem(last=False)
+        return model
+
+    def _zscore_detect(self, data, sensitivity):
+        amounts = cost_array(data)
+        mean, std = np.mean(amounts), np.std(amounts)
+        threshold = 3.0 - (sensitivity * 4)
+
+        # Score every point in one compiled pass; only flagged points become records
+        mask, z_scores = _zscore_core(amounts, mean, std, threshold)
+
+        anomalies = []
+        for i in np.flatnonzero(mask):
+            amount, z_score = amounts[i], z_scores[i]
+            deviation = amount - mean
+            deviation_pct = (deviation / mean) * 100 if mean > 0 else 0
+            anomalies.append({
+                "date": data[i].date,
+                "actual_amount": amount,
+                "expected_amount": round(mean, 2),
+                "deviation": round(deviation, 2),
+                "deviation_pct": round(deviation_pct, 2),
+                "score": round(min(z_score / 5, 1), 4),
+                "severity": self._classify_severity(abs(deviation_pct)),
+            })
+        return anomalies
+
+    def _classify_severity(self, deviation_pct):
+        if deviation_pct >= 100: return "critical"
+        if deviation_pct >= 50: return "high"
+        if deviation_pct >= 25: return "medium"
+        return "low"
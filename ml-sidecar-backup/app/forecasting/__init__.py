@@ -1,5 +1,6 @@
 """Forecasting module for FinOpsMind ML sidecar."""
 
-from .prophet import CostForecaster, generate_forecast
+from .prophet import CostForecaster, generate_forecast, generate_forecast_arrays
+from .service import ForecastingService
 
-__all__ = ['CostForecaster', 'generate_forecast']
+__all__ = ['CostForecaster', 'generate_forecast', 'generate_forecast_arrays', 'ForecastingService']
@@ -4,8 +4,8 @@ Generates daily cost forecasts with confidence intervals.
 """
 
 import logging
-from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Tuple
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple, Union
 import numpy as np
 import pandas as pd
 
@@ -18,6 +18,16 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+# A short series forecast over a short horizon uses the linear trend model;
+# Prophet's fit costs far more than it adds at that size
+LINEAR_MAX_HISTORY = 30
+LINEAR_MAX_PERIODS = 14
+
+
+def use_linear_model(n_points: int, periods: int) -> bool:
+    """Whether a forecast is small enough to skip Prophet."""
+    return n_points < LINEAR_MAX_HISTORY and periods <= LINEAR_MAX_PERIODS
+
 
 class CostForecaster:
     """
@@ -32,21 +42,45 @@ class CostForecaster:
         yearly_seasonality: bool = False,
         changepoint_prior_scale: float = 0.05,
         seasonality_prior_scale: float = 10.0,
+        uncertainty_samples: int = 200,
+        fast_mode: bool = False,
     ):
+        """
+        Initialize the forecaster.
+        
+        Args:
+            weekly_seasonality: Include weekly patterns
+            monthly_seasonality: Include a 30.5-day seasonality term
+            yearly_seasonality: Include yearly patterns
+            changepoint_prior_scale: Flexibility of the trend
+            seasonality_prior_scale: Strength of the seasonality terms
+            uncertainty_samples: Monte Carlo draws Prophet uses for the
+                confidence intervals; this dominates predict() latency
+            fast_mode: Skip interval estimation entirely and return point
+                forecasts only
+        """
         self.weekly_seasonality = weekly_seasonality
         self.monthly_seasonality = monthly_seasonality
         self.yearly_seasonality = yearly_seasonality
         self.changepoint_prior_scale = changepoint_prior_scale
         self.seasonality_prior_scale = seasonality_prior_scale
+        self.fast_mode = fast_mode
+        self.uncertainty_samples = 0 if fast_mode else uncertainty_samples
         self.model: Optional[Prophet] = None
         self._is_fitted = False
+        self._use_prophet = PROPHET_AVAILABLE
+        self._last_forecast: Optional[pd.DataFrame] = None
         
-    def _prepare_data(self, historical_data: List[Dict]) -> pd.DataFrame:
+    def _prepare_data(
+        self,
+        historical_data: Union[List[Dict], Dict[str, np.ndarray]]
+    ) -> pd.DataFrame:
         """
         Convert historical cost data to Prophet format.
         
         Args:
-            historical_data: List of {"date": "YYYY-MM-DD", "cost": float}
+            historical_data: List of {"date": "YYYY-MM-DD", "cost": float},
+                or a mapping of column name to array (e.g. {"date": ..., "cost": ...})
             
         Returns:
             DataFrame with 'ds' and 'y' columns
@@ -82,12 +116,20 @@ class CostForecaster:
         
         return df[['ds', 'y']]
     
-    def fit(self, historical_data: List[Dict]) -> 'CostForecaster':
+    def fit(
+        self,
+        historical_data: Union[List[Dict], Dict[str, np.ndarray]],
+        periods: Optional[int] = None,
+    ) -> 'CostForecaster':
         """
         Train the Prophet model on historical cost data.
         
         Args:
-            historical_data: List of {"date": "YYYY-MM-DD", "cost": float}
+            historical_data: List of {"date": "YYYY-MM-DD", "cost": float},
+                or a mapping of column name to array
+            periods: Horizon the model will forecast, if known; a short
+                history forecast over a short horizon uses the linear
+                trend model instead of fitting Prophet
             
         Returns:
             self for method chaining
@@ -97,7 +139,12 @@ class CostForecaster:
         if len(df) < 14:
             raise ValueError("Need at least 14 days of data for reliable forecasting")
         
-        if not PROPHET_AVAILABLE:
+        self._last_forecast = None
+        self._use_prophet = PROPHET_AVAILABLE and not (
+            periods is not None and use_linear_model(len(df), periods)
+        )
+        
+        if not self._use_prophet:
             # Store data for fallback
             self._fallback_data = df
             self._is_fitted = True
@@ -110,6 +157,8 @@ class CostForecaster:
             changepoint_prior_scale=self.changepoint_prior_scale,
             seasonality_prior_scale=self.seasonality_prior_scale,
             interval_width=0.95,  # 95% confidence interval
+            uncertainty_samples=self.uncertainty_samples,
+            stan_backend='CMDSTANPY',  # precompiled model shipped with prophet
         )
         
         # Add monthly seasonality if requested
@@ -141,20 +190,27 @@ class CostForecaster:
             
         Returns:
             Dictionary with forecast data including confidence intervals
+            (point forecasts only in fast mode)
         """
         if not self._is_fitted:
             raise RuntimeError("Model must be fitted before prediction")
         
-        if not PROPHET_AVAILABLE:
+        if not self._use_prophet:
             return self._fallback_predict(periods, include_history)
         
         # Create future dataframe
         future = self.model.make_future_dataframe(periods=periods)
         
-        # Generate predictions
+        # Generate predictions, keeping them for get_components()
         forecast = self.model.predict(future)
+        self._last_forecast = forecast
         
-        # Extract relevant columns
+        # Extract relevant columns; Prophet returns every component term but
+        # only the point forecast and interval are formatted below
+        if self.uncertainty_samples:
+            forecast = forecast[['ds', 'yhat', 'yhat_lower', 'yhat_upper']]
+        else:
+            forecast = forecast[['ds', 'yhat']]
         if include_history:
             result_df = forecast
         else:
@@ -162,17 +218,38 @@ class CostForecaster:
             cutoff = self.model.history['ds'].max()
             result_df = forecast[forecast['ds'] > cutoff]
         
-        # Format output
-        predictions = []
-        for _, row in result_df.iterrows():
-            predictions.append({
-                'date': row['ds'].strftime('%Y-%m-%d'),
-                'predicted_cost': round(max(0, row['yhat']), 2),
-                'lower_bound_80': round(max(0, row['yhat_lower'] + 0.1 * (row['yhat'] - row['yhat_lower'])), 2),
-                'upper_bound_80': round(row['yhat_upper'] - 0.1 * (row['yhat_upper'] - row['yhat']), 2),
-                'lower_bound_95': round(max(0, row['yhat_lower']), 2),
-                'upper_bound_95': round(row['yhat_upper'], 2),
-            })
+        # Format output column-wise rather than materializing a Series per row
+        dates = result_df['ds'].dt.strftime('%Y-%m-%d').tolist()
+        yhat = result_df['yhat'].to_numpy()
+        predicted = np.round(np.maximum(0, yhat), 2).tolist()
+        
+        if not self.uncertainty_samples:
+            predictions = [
+                {'date': date, 'predicted_cost': cost}
+                for date, cost in zip(dates, predicted)
+            ]
+        else:
+            yhat_lower = result_df['yhat_lower'].to_numpy()
+            yhat_upper = result_df['yhat_upper'].to_numpy()
+            columns = (
+                dates,
+                predicted,
+                np.round(np.maximum(0, yhat_lower + 0.1 * (yhat - yhat_lower)), 2).tolist(),
+                np.round(yhat_upper - 0.1 * (yhat_upper - yhat), 2).tolist(),
+                np.round(np.maximum(0, yhat_lower), 2).tolist(),
+                np.round(yhat_upper, 2).tolist(),
+            )
+            predictions = [
+                {
+                    'date': date,
+                    'predicted_cost': cost,
+                    'lower_bound_80': lower_80,
+                    'upper_bound_80': upper_80,
+                    'lower_bound_95': lower_95,
+                    'upper_bound_95': upper_95,
+                }
+                for date, cost, lower_80, upper_80, lower_95, upper_95 in zip(*columns)
+            ]
         
         # Calculate summary statistics
         total_predicted = sum(p['predicted_cost'] for p in predictions)
@@ -213,31 +290,39 @@ class CostForecaster:
         weekly_pattern = df.groupby('dow')['y'].mean()
         weekly_adjustment = weekly_pattern - weekly_pattern.mean()
         
-        # Generate predictions
+        # Generate predictions for all future days at once
         last_date = df['ds'].max()
         last_day_num = df['day_num'].max()
         
-        predictions = []
-        for i in range(1, periods + 1):
-            pred_date = last_date + timedelta(days=i)
-            day_num = last_day_num + i
-            dow = pred_date.dayofweek
-            
-            # Base prediction with trend
-            base_pred = mean_cost + slope * (day_num - df['day_num'].mean())
-            
-            # Add weekly adjustment
-            if dow in weekly_adjustment.index:
-                base_pred += weekly_adjustment[dow]
-            
-            predictions.append({
-                'date': pred_date.strftime('%Y-%m-%d'),
-                'predicted_cost': round(max(0, base_pred), 2),
-                'lower_bound_80': round(max(0, base_pred - 1.28 * std_cost), 2),
-                'upper_bound_80': round(base_pred + 1.28 * std_cost, 2),
-                'lower_bound_95': round(max(0, base_pred - 1.96 * std_cost), 2),
-                'upper_bound_95': round(base_pred + 1.96 * std_cost, 2),
-            })
+        future_dates = pd.date_range(last_date + pd.Timedelta(days=1), periods=periods)
+        day_nums = np.arange(last_day_num + 1, last_day_num + periods + 1)
+        
+        # Base prediction with trend, plus weekly adjustment (0 for unseen days)
+        base_pred = mean_cost + slope * (day_nums - df['day_num'].mean())
+        weekly_map = weekly_adjustment.reindex(range(7), fill_value=0).to_numpy()
+        base_pred = base_pred + weekly_map[future_dates.dayofweek.to_numpy()]
+        
+        margin_80 = 1.28 * std_cost
+        margin_95 = 1.96 * std_cost
+        columns = (
+            future_dates.strftime('%Y-%m-%d').tolist(),
+            np.round(np.maximum(0, base_pred), 2).tolist(),
+            np.round(np.maximum(0, base_pred - margin_80), 2).tolist(),
+            np.round(base_pred + margin_80, 2).tolist(),
+            np.round(np.maximum(0, base_pred - margin_95), 2).tolist(),
+            np.round(base_pred + margin_95, 2).tolist(),
+        )
+        predictions = [
+            {
+                'date': date,
+                'predicted_cost': predicted,
+                'lower_bound_80': lower_80,
+                'upper_bound_80': upper_80,
+                'lower_bound_95': lower_95,
+                'upper_bound_95': upper_95,
+            }
+            for date, predicted, lower_80, upper_80, lower_95, upper_95 in zip(*columns)
+        ]
         
         total_predicted = sum(p['predicted_cost'] for p in predictions)
         
@@ -251,46 +336,65 @@ class CostForecaster:
                 'forecast_start': predictions[0]['date'],
                 'forecast_end': predictions[-1]['date'],
             },
-            'note': 'Using fallback forecasting (Prophet not available)'
+            'note': (
+                'Using linear trend forecast (short history and horizon)'
+                if PROPHET_AVAILABLE
+                else 'Using fallback forecasting (Prophet not available)'
+            )
         }
     
     def get_components(self) -> Optional[Dict]:
         """
         Get the decomposed forecast components (trend, seasonality).
+        
+        Reuses the forecast from the last `predict()` call when available;
+        otherwise predicts 30 days ahead. Each component is returned as
+        parallel ``{'ds': [...], 'value': [...]}`` lists.
         """
         if not self._is_fitted or not PROPHET_AVAILABLE or self.model is None:
             return None
         
-        future = self.model.make_future_dataframe(periods=30)
-        forecast = self.model.predict(future)
+        forecast = self._last_forecast
+        if forecast is None:
+            future = self.model.make_future_dataframe(periods=30)
+            forecast = self.model.predict(future)
+            self._last_forecast = forecast
+        
+        dates = forecast['ds'].dt.strftime('%Y-%m-%d').tolist()
+        
+        def column(name: str) -> Dict[str, List]:
+            return {'ds': dates, 'value': forecast[name].round(4).tolist()}
         
         components = {
-            'trend': forecast[['ds', 'trend']].to_dict('records'),
+            'trend': column('trend'),
         }
         
         if self.weekly_seasonality:
-            components['weekly'] = forecast[['ds', 'weekly']].to_dict('records')
+            components['weekly'] = column('weekly')
         
         if self.monthly_seasonality and 'monthly' in forecast.columns:
-            components['monthly'] = forecast[['ds', 'monthly']].to_dict('records')
+            components['monthly'] = column('monthly')
         
         return components
 
 
 def generate_forecast(
-    historical_data: List[Dict],
+    historical_data: Union[List[Dict], Dict[str, np.ndarray]],
     periods: int = 30,
     weekly_seasonality: bool = True,
     monthly_seasonality: bool = True,
+    fast_mode: bool = False,
 ) -> Dict:
     """
     Convenience function to generate a forecast from historical data.
     
     Args:
-        historical_data: List of {"date": "YYYY-MM-DD", "cost": float}
+        historical_data: List of {"date": "YYYY-MM-DD", "cost": float},
+            or a mapping of column name to array
         periods: Number of days to forecast
         weekly_seasonality: Include weekly patterns
         monthly_seasonality: Include monthly patterns
+        fast_mode: Return point forecasts only, skipping interval sampling
         
     Returns:
         Forecast dictionary with predictions and confidence intervals
@@ -298,7 +402,42 @@ def generate_forecast(
     forecaster = CostForecaster(
         weekly_seasonality=weekly_seasonality,
         monthly_seasonality=monthly_seasonality,
+        fast_mode=fast_mode,
     )
     
-    forecaster.fit(historical_data)
+    forecaster.fit(historical_data, periods=periods)
     return forecaster.predict(periods=periods)
+
+
+def generate_forecast_arrays(
+    dates: np.ndarray,
+    costs: np.ndarray,
+    periods: int = 30,
+    weekly_seasonality: bool = True,
+    monthly_seasonality: bool = True,
+    fast_mode: bool = False,
+) -> Dict:
+    """
+    Generate a forecast from parallel date and cost arrays.
+    
+    Same as `generate_forecast`, but the input is handed to pandas as
+    columns instead of one dict per day.
+    
+    Args:
+        dates: datetime64 array of observation dates
+        costs: float array of daily costs, aligned with ``dates``
+        periods: Number of days to forecast
+        weekly_seasonality: Include weekly patterns
+        monthly_seasonality: Include monthly patterns
+        fast_mode: Return point forecasts only, skipping interval sampling
+        
+    Returns:
+        Forecast dictionary with predictions and confidence intervals
+    """
+    return generate_forecast(
+        historical_data={'date': dates, 'cost': costs},
+        periods=periods,
+        weekly_seasonality=weekly_seasonality,
+        monthly_seasonality=monthly_seasonality,
+        fast_mode=fast_mode,
+    )
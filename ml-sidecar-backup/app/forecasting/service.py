@@ -0,0 +1,107 @@
+"""
+Organization-level cost forecasting service for the /api/v1 endpoints.
+Uses Prophet when installed, otherwise a linear trend with a residual band.
+"""
+
+import logging
+from datetime import datetime
+from typing import Dict, List, Sequence
+import numpy as np
+import pandas as pd
+
+try:
+    from prophet import Prophet
+    PROPHET_AVAILABLE = True
+except ImportError:
+    PROPHET_AVAILABLE = False
+
+from points import cost_array, date_array
+from .prophet import use_linear_model
+
+logger = logging.getLogger(__name__)
+
+
+class ForecastingService:
+    """
+    Forecasts daily cost for a series of ``{date, cost}`` points.
+
+    Points are any objects with ``date`` (YYYY-MM-DD) and ``cost``
+    attributes; forecasts are returned as ``{date, predicted, lower_bound,
+    upper_bound}`` dicts.
+    """
+
+    PROPHET_VERSION = "prophet-1.0"
+    LINEAR_VERSION = "linear-regression-1.0"
+
+    def __init__(self):
+        # Model for forecasts too large for the linear path
+        self.model_version = self.PROPHET_VERSION if PROPHET_AVAILABLE else self.LINEAR_VERSION
+
+    @staticmethod
+    def _uses_prophet(n_points: int, forecast_days: int) -> bool:
+        """Whether a forecast of this size runs Prophet rather than the linear trend."""
+        return PROPHET_AVAILABLE and not use_linear_model(n_points, forecast_days)
+
+    def model_version_for(self, n_points: int, forecast_days: int) -> str:
+        """Version of the model `forecast` uses for ``n_points`` of history and ``forecast_days``."""
+        return self.PROPHET_VERSION if self._uses_prophet(n_points, forecast_days) else self.LINEAR_VERSION
+
+    def forecast(self, data: Sequence, forecast_days: int, confidence_level: float) -> List[Dict]:
+        """
+        Forecast ``forecast_days`` days past the last point.
+
+        Args:
+            data: Historical points, oldest first
+            forecast_days: Number of days to forecast
+            confidence_level: Width of the prediction interval
+        """
+        if len(data) < 7:
+            raise ValueError("Need at least 7 data points")
+
+        if self._uses_prophet(len(data), forecast_days):
+            return self._prophet_forecast(data, forecast_days, confidence_level)
+        return self._linear_forecast(data, forecast_days, confidence_level)
+
+    def _prophet_forecast(self, data, forecast_days, confidence_level):
+        # Columns go in already typed, so no row transposition or date parsing
+        df = pd.DataFrame({"ds": date_array(data), "y": cost_array(data)})
+
+        model = Prophet(
+            interval_width=confidence_level, daily_seasonality=False, weekly_seasonality=True,
+            stan_backend="CMDSTANPY",
+        )
+        model.fit(df)
+
+        future = model.make_future_dataframe(periods=forecast_days)
+        forecast = model.predict(future).tail(forecast_days)
+
+        return [{
+            "date": row["ds"].strftime("%Y-%m-%d"),
+            "predicted": max(0, row["yhat"]),
+            "lower_bound": max(0, row["yhat_lower"]),
+            "upper_bound": max(0, row["yhat_upper"]),
+        } for _, row in forecast.iterrows()]
+
+    def _linear_forecast(self, data, forecast_days, confidence_level):
+        amounts = cost_array(data)
+        x = np.arange(len(amounts))
+        slope, intercept = np.polyfit(x, amounts, 1)
+        std_error = np.std(amounts - (slope * x + intercept))
+        z_score = 1.96 if confidence_level >= 0.95 else 1.645
+
+        # Whole horizon at once: trend, band and dates as arrays
+        future_x = np.arange(len(amounts), len(amounts) + forecast_days)
+        predicted = slope * future_x + intercept
+        margin = z_score * std_error
+        last_date = np.datetime64(datetime.strptime(data[-1].date, "%Y-%m-%d").date(), "D")
+        dates = np.datetime_as_string(last_date + np.arange(1, forecast_days + 1), unit="D")
+
+        return [
+            {"date": d, "predicted": p, "lower_bound": lo, "upper_bound": hi}
+            for d, p, lo, hi in zip(
+                dates.tolist(),
+                np.maximum(predicted, 0).tolist(),
+                np.maximum(predicted - margin, 0).tolist(),
+                np.maximum(predicted + margin, 0).tolist(),
+            )
+        ]
@@ -3,18 +3,32 @@ FinOpsMind ML Sidecar - FastAPI application
 Provides ML endpoints for cost forecasting and anomaly detection.
 """
 
+import asyncio
+import functools
+import hashlib
 import logging
 import os
-from datetime import datetime
-from typing import Dict, List, Optional
+import threading
+import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional
 from contextlib import asynccontextmanager
 
-from fastapi import FastAPI, HTTPException, BackgroundTasks
+import numpy as np
+import pandas as pd
+from fastapi import FastAPI, HTTPException, BackgroundTasks, Request
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel, Field
+from fastapi.responses import JSONResponse
+from pydantic import AliasChoices, BaseModel, ConfigDict, Field
 
-from forecasting.prophet import CostForecaster, generate_forecast
-from anomaly.isolation_forest import CostAnomalyDetector, detect_anomalies
+from cache import LRUCache
+from points import cost_array, date_array
+from forecasting.prophet import CostForecaster, LINEAR_MAX_PERIODS
+from forecasting.service import ForecastingService
+from anomaly.isolation_forest import CostAnomalyDetector, detect_anomalies_arrays
+from anomaly.service import AnomalyDetectionService
 
 # Configure logging
 logging.basicConfig(
@@ -23,27 +37,81 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-# Cache for trained models
-model_cache: Dict[str, any] = {
-    'forecaster': None,
-    'anomaly_detector': None,
-    'forecast_cache': {},
-    'last_forecast_time': None,
-    'last_anomaly_time': None,
-}
+# Maximum number of fitted forecasters kept for repeated series
+FIT_CACHE_SIZE = int(os.getenv("ML_FIT_CACHE_SIZE", "32"))
+
+# Uvicorn worker processes outside development. Trained models, caches and
+# /health state live in each process, so /train/anomaly-detector followed by
+# /anomalies/score only works reliably with a single worker; raise this only
+# once that state is kept outside the process.
+WORKERS = int(os.getenv("WORKERS", "1"))
+
+# Threads running model fits off the event loop; by default the CPUs are
+# shared out between worker processes rather than each taking all of them
+EXECUTOR_WORKERS = int(os.getenv("ML_EXECUTOR_WORKERS", str(max(1, (os.cpu_count() or 1) // WORKERS))))
+
+# Forecast responses kept per account/horizon, and for how long (seconds)
+FORECAST_CACHE_SIZE = int(os.getenv("ML_FORECAST_CACHE_SIZE", "512"))
+FORECAST_CACHE_TTL = 3600
+
+# Largest request body accepted, in bytes; larger ones are refused before parsing
+MAX_REQUEST_BYTES = int(os.getenv("ML_MAX_REQUEST_BYTES", "2000000"))
+
+
+def _empty_model_cache() -> Dict[str, any]:
+    """Fresh set of cache entries."""
+    return {
+        'forecaster': None,
+        'anomaly_detector': None,
+        'forecast_cache': LRUCache(FORECAST_CACHE_SIZE, ttl=FORECAST_CACHE_TTL),
+        'fit_cache': LRUCache(FIT_CACHE_SIZE),
+        # Epoch seconds; formatted only when /health reports them
+        'last_forecast_time': None,
+        'last_anomaly_time': None,
+    }
+
+
+# Cache for trained models; reset in one update under the lock
+model_cache: Dict[str, any] = _empty_model_cache()
+model_cache_lock = threading.Lock()
+
+# One lock per forecast cache key, so concurrent requests for the same
+# account/horizon compute the forecast once; unused locks are dropped
+_forecast_locks: 'weakref.WeakValueDictionary[str, asyncio.Lock]' = weakref.WeakValueDictionary()
+
+# Fits currently running, by series key; concurrent requests for the same
+# series wait on the running fit instead of starting their own
+_pending_fits: Dict[str, asyncio.Future] = {}
 
 
 # ==================== Pydantic Models ====================
 
 class CostDataPoint(BaseModel):
     """Single cost data point."""
+    # Requests carry one of these per day, so keep per-item validation to
+    # the declared fields: unknown keys are dropped without being checked
+    model_config = ConfigDict(extra='ignore', validate_default=False)
+    
     date: str = Field(..., description="Date in YYYY-MM-DD format")
-    cost: float = Field(..., description="Cost value", ge=0)
+    cost: float = Field(
+        ..., description="Cost value", ge=0,
+        validation_alias=AliasChoices('cost', 'amount'),
+    )
     service_breakdown: Optional[Dict[str, float]] = Field(
         None, description="Optional breakdown by service"
     )
 
 
+class OrgCostDataPoint(CostDataPoint):
+    """Single cost data point for the /api/v1 endpoints."""
+    # v1 amounts have never been range-checked: credits and refunds come
+    # through as negative days
+    cost: float = Field(
+        ..., description="Cost value; negative for credits and refunds",
+        validation_alias=AliasChoices('cost', 'amount'),
+    )
+
+
 class ForecastRequest(BaseModel):
     """Request model for cost forecasting."""
     historical_data: List[CostDataPoint] = Field(
@@ -102,15 +170,193 @@ class HealthResponse(BaseModel):
     cache_status: Dict
 
 
+class OrgForecastRequest(BaseModel):
+    """Request model for organization-level forecasting (/api/v1)."""
+    organization_id: str
+    data: List[OrgCostDataPoint]
+    forecast_days: int = Field(default=30, ge=7, le=90)
+    granularity: str = "daily"
+    confidence_level: float = Field(default=0.95, ge=0.5, le=0.99)
+
+
+class ForecastPoint(BaseModel):
+    """Single forecast day with its prediction interval."""
+    date: str
+    predicted: float
+    lower_bound: float
+    upper_bound: float
+
+
+class OrgForecastResponse(BaseModel):
+    """Response model for organization-level forecasting (/api/v1)."""
+    organization_id: str
+    generated_at: datetime
+    model_version: str
+    forecasts: List[ForecastPoint]
+    total_forecasted: float
+    confidence_level: float
+
+
+class OrgAnomalyRequest(BaseModel):
+    """Request model for organization-level anomaly detection (/api/v1)."""
+    organization_id: str
+    data: List[OrgCostDataPoint]
+    sensitivity: float = Field(default=0.1, ge=0.01, le=0.5)
+
+
+class DetectedAnomaly(BaseModel):
+    """Single anomalous day and its deviation from the series mean."""
+    date: str
+    actual_amount: float
+    expected_amount: float
+    deviation: float
+    deviation_pct: float
+    score: float
+    severity: str
+
+
+class OrgAnomalyResponse(BaseModel):
+    """Response model for organization-level anomaly detection (/api/v1)."""
+    organization_id: str
+    analyzed_at: datetime
+    model_version: str
+    anomalies: List[DetectedAnomaly]
+    total_analyzed: int
+    anomaly_count: int
+    threshold: float
+
+
+# ==================== Array Conversion ====================
+
+def _service_arrays(points: List[CostDataPoint]) -> Dict[str, np.ndarray]:
+    """
+    Collect service breakdowns into one array per service.
+    
+    Points that do not report a service get NaN for it, as they would
+    when building a DataFrame from per-point dicts.
+    """
+    services: Dict[str, np.ndarray] = {}
+    for i, dp in enumerate(points):
+        if not dp.service_breakdown:
+            continue
+        for name, value in dp.service_breakdown.items():
+            column = services.get(name)
+            if column is None:
+                column = services[name] = np.full(len(points), np.nan)
+            column[i] = value
+    return services
+
+
+def _cost_columns(points: List[CostDataPoint]) -> Dict[str, np.ndarray]:
+    """Columnar view of points: date, cost, and one column per service."""
+    return {
+        'date': date_array(points),
+        'cost': cost_array(points),
+        **_service_arrays(points),
+    }
+
+
+def _series_key(dates: np.ndarray, costs: np.ndarray, *params) -> str:
+    """Digest of a series and the model settings it is fitted with."""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(dates.tobytes())
+    digest.update(costs.tobytes())
+    digest.update(repr(params).encode())
+    return digest.hexdigest()
+
+
+def _fit_forecaster(
+    key: str,
+    dates: np.ndarray,
+    costs: np.ndarray,
+    periods: int,
+    weekly_seasonality: bool,
+    monthly_seasonality: bool,
+) -> CostForecaster:
+    """Fit a forecaster and store it in the fit cache under ``key``."""
+    forecaster = CostForecaster(
+        weekly_seasonality=weekly_seasonality,
+        monthly_seasonality=monthly_seasonality,
+    )
+    forecaster.fit({'date': dates, 'cost': costs}, periods=periods)
+    model_cache['fit_cache'].set(key, forecaster)
+    return forecaster
+
+
+async def _fitted_forecaster(
+    dates: np.ndarray,
+    costs: np.ndarray,
+    periods: int,
+    weekly_seasonality: bool,
+    monthly_seasonality: bool,
+) -> CostForecaster:
+    """
+    Return a forecaster fitted on the given series.
+    
+    Fitting dominates forecast latency, so fitted models are kept in an LRU
+    keyed by the series content; identical series (e.g. the same dashboard
+    reloaded, or shared across accounts) only pay for predict(). Requests
+    that arrive while the same series is being fitted share that fit.
+    
+    Whether the fit uses Prophet or the linear model depends only on the
+    series and on whether ``periods`` is a short horizon, so that is part
+    of the key rather than ``periods`` itself.
+    """
+    short_horizon = periods <= LINEAR_MAX_PERIODS
+    key = _series_key(dates, costs, weekly_seasonality, monthly_seasonality, short_horizon)
+    
+    forecaster = model_cache['fit_cache'].get(key)
+    if forecaster is not None:
+        logger.info("Reusing fitted forecaster for identical series")
+        return forecaster
+    
+    pending = _pending_fits.get(key)
+    if pending is None:
+        pending = asyncio.ensure_future(run_blocking(
+            _fit_forecaster, key, dates, costs, periods, weekly_seasonality, monthly_seasonality
+        ))
+        _pending_fits[key] = pending
+        pending.add_done_callback(lambda _: _pending_fits.pop(key, None))
+    else:
+        logger.info("Joining in-flight fit for identical series")
+    
+    # Shielded so one caller disconnecting does not cancel the shared fit
+    return await asyncio.shield(pending)
+
+
+def _iso_timestamp(ts: Optional[float]) -> Optional[str]:
+    """Format an epoch timestamp as a naive UTC ISO string, as /health reports it."""
+    if ts is None:
+        return None
+    return datetime.fromtimestamp(ts, timezone.utc).replace(tzinfo=None).isoformat()
+
+
+def _forecast_lock(cache_key: str) -> asyncio.Lock:
+    """Lock serializing forecast computation for one cache key."""
+    lock = _forecast_locks.get(cache_key)
+    if lock is None:
+        lock = _forecast_locks[cache_key] = asyncio.Lock()
+    return lock
+
+
+# Services behind the organization-level /api/v1 endpoints
+forecasting_service = ForecastingService()
+anomaly_service = AnomalyDetectionService()
+
+
 # ==================== Lifespan Management ====================
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan manager."""
     logger.info("Starting FinOpsMind ML Sidecar...")
+    app.state.executor = ThreadPoolExecutor(
+        max_workers=EXECUTOR_WORKERS, thread_name_prefix="ml-worker"
+    )
     logger.info("ML endpoints ready")
     yield
     logger.info("Shutting down ML Sidecar...")
+    app.state.executor.shutdown(wait=False, cancel_futures=True)
 
 
 # ==================== FastAPI App ====================
@@ -132,7 +378,35 @@ app.add_middleware(
 )
 
 
+@app.middleware("http")
+async def limit_request_size(request: Request, call_next):
+    """Reject oversized bodies by Content-Length before they are read and validated."""
+    content_length = request.headers.get("content-length")
+    if content_length and content_length.isdigit() and int(content_length) > MAX_REQUEST_BYTES:
+        return JSONResponse(
+            status_code=413,
+            content={"detail": f"Request body exceeds {MAX_REQUEST_BYTES} bytes"},
+        )
+    return await call_next(request)
+
+
+async def run_blocking(func: Callable, *args, **kwargs):
+    """
+    Run CPU-bound model work on the worker pool instead of the event loop.
+    
+    Prophet fits in a cmdstan subprocess and NumPy/scikit-learn release the
+    GIL in their kernels, so threads overlap the expensive parts while
+    fitted models and caches stay shared in this process.
+    """
+    loop = asyncio.get_running_loop()
+    executor = getattr(app.state, 'executor', None)
+    return await loop.run_in_executor(executor, functools.partial(func, *args, **kwargs))
+
+
 # ==================== Endpoints ====================
+# Handlers with a response_model return plain dicts: FastAPI validates and
+# encodes them to JSON through pydantic-core once, instead of also building
+# the response model in the handler.
 
 @app.get("/health", response_model=HealthResponse)
 async def health_check():
@@ -150,8 +424,9 @@ async def health_check():
         },
         cache_status={
             "forecast_cache_size": len(model_cache['forecast_cache']),
-            "last_forecast_time": model_cache['last_forecast_time'],
-            "last_anomaly_time": model_cache['last_anomaly_time'],
+            "fit_cache_size": len(model_cache['fit_cache']),
+            "last_forecast_time": _iso_timestamp(model_cache['last_forecast_time']),
+            "last_anomaly_time": _iso_timestamp(model_cache['last_anomaly_time']),
         }
     )
 
@@ -170,15 +445,13 @@ async def generate_cost_forecast(request: ForecastRequest):
     - **monthly_seasonality**: Include monthly patterns (default: True)
     """
     try:
-        # Check cache if account_id provided
+        # Check cache if account_id provided (entries expire after an hour)
         cache_key = f"{request.account_id}_{request.periods}" if request.account_id else None
-        if cache_key and cache_key in model_cache['forecast_cache']:
-            cached = model_cache['forecast_cache'][cache_key]
-            # Return cached if less than 1 hour old
-            cache_time = datetime.fromisoformat(cached['forecast_generated_at'])
-            if (datetime.utcnow() - cache_time).seconds < 3600:
+        if cache_key:
+            cached = model_cache['forecast_cache'].get(cache_key)
+            if cached is not None:
                 logger.info(f"Returning cached forecast for {cache_key}")
-                return ForecastResponse(**cached, cached=True)
+                return {**cached, 'cached': True}
         
         # Validate data length
         if len(request.historical_data) < 14:
@@ -187,28 +460,36 @@ async def generate_cost_forecast(request: ForecastRequest):
                 detail="Need at least 14 days of historical data for forecasting"
             )
         
-        # Convert to list of dicts
-        historical = [
-            {"date": dp.date, "cost": dp.cost}
-            for dp in request.historical_data
-        ]
+        # Convert to arrays
+        dates = date_array(request.historical_data)
+        costs = cost_array(request.historical_data)
         
-        # Generate forecast
-        logger.info(f"Generating {request.periods}-day forecast from {len(historical)} data points")
+        async def compute() -> Dict:
+            logger.info(f"Generating {request.periods}-day forecast from {len(costs)} data points")
+            forecaster = await _fitted_forecaster(
+                dates,
+                costs,
+                periods=request.periods,
+                weekly_seasonality=request.weekly_seasonality,
+                monthly_seasonality=request.monthly_seasonality,
+            )
+            result = await run_blocking(forecaster.predict, periods=request.periods)
+            model_cache['last_forecast_time'] = time.time()
+            return result
         
-        result = generate_forecast(
-            historical_data=historical,
-            periods=request.periods,
-            weekly_seasonality=request.weekly_seasonality,
-            monthly_seasonality=request.monthly_seasonality,
-        )
+        if not cache_key:
+            return {**await compute(), 'cached': False}
         
-        # Update cache
-        model_cache['last_forecast_time'] = datetime.utcnow().isoformat()
-        if cache_key:
-            model_cache['forecast_cache'][cache_key] = result
+        # Generate forecast once per key; requests that waited on the lock
+        # pick up the result stored by the first one
+        async with _forecast_lock(cache_key):
+            cached = model_cache['forecast_cache'].get(cache_key)
+            if cached is not None:
+                return {**cached, 'cached': True}
+            result = await compute()
+            model_cache['forecast_cache'].set(cache_key, result)
         
-        return ForecastResponse(**result, cached=False)
+        return {**result, 'cached': False}
         
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
@@ -238,36 +519,35 @@ async def detect_cost_anomalies(request: AnomalyRequest):
                 detail="Need at least 7 days of data for anomaly detection"
             )
         
-        # Convert to list of dicts
-        cost_data = [
-            {"date": dp.date, "cost": dp.cost, **(dp.service_breakdown or {})}
-            for dp in request.cost_data
-        ]
+        # Convert to arrays
+        dates = date_array(request.cost_data)
+        costs = cost_array(request.cost_data)
+        service_costs = _service_arrays(request.cost_data)
         
         training_data = None
         if request.training_data:
-            training_data = [
-                {"date": dp.date, "cost": dp.cost, **(dp.service_breakdown or {})}
-                for dp in request.training_data
-            ]
+            training_data = _cost_columns(request.training_data)
         
         # Detect anomalies
-        logger.info(f"Detecting anomalies in {len(cost_data)} data points")
+        logger.info(f"Detecting anomalies in {len(costs)} data points")
         
-        result = detect_anomalies(
-            cost_data=cost_data,
+        result = await run_blocking(
+            detect_anomalies_arrays,
+            dates=dates,
+            costs=costs,
+            service_costs=service_costs,
             training_data=training_data,
             contamination=request.contamination,
         )
         
         # Update cache
-        model_cache['last_anomaly_time'] = datetime.utcnow().isoformat()
+        model_cache['last_anomaly_time'] = time.time()
         
         # Filter all_results if not requested
         if not request.return_all_scores:
             result['all_results'] = None
         
-        return AnomalyResponse(**result)
+        return result
         
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
@@ -306,26 +586,28 @@ async def train_forecaster(request: ForecastRequest, background_tasks: Backgroun
     Pre-train a forecaster model for faster predictions.
     Training happens in the background.
     """
-    def do_training(historical_data: List[Dict]):
+    def do_training(dates: np.ndarray, costs: np.ndarray, weekly: bool, monthly: bool):
         try:
             forecaster = CostForecaster(
-                weekly_seasonality=request.weekly_seasonality,
-                monthly_seasonality=request.monthly_seasonality,
+                weekly_seasonality=weekly,
+                monthly_seasonality=monthly,
             )
-            forecaster.fit(historical_data)
+            forecaster.fit({'date': dates, 'cost': costs})
             model_cache['forecaster'] = forecaster
             logger.info("Forecaster training complete")
         except Exception as e:
             logger.error(f"Background training failed: {e}")
     
-    historical = [
-        {"date": dp.date, "cost": dp.cost}
-        for dp in request.historical_data
-    ]
+    # Hand the task arrays and plain settings, so the parsed request and its
+    # per-point objects are not kept alive until training finishes
+    dates = date_array(request.historical_data)
+    costs = cost_array(request.historical_data)
     
-    background_tasks.add_task(do_training, historical)
+    background_tasks.add_task(
+        do_training, dates, costs, request.weekly_seasonality, request.monthly_seasonality
+    )
     
-    return {"status": "training_started", "data_points": len(historical)}
+    return {"status": "training_started", "data_points": len(costs)}
 
 
 @app.post("/train/anomaly-detector")
@@ -334,37 +616,65 @@ async def train_anomaly_detector(request: AnomalyRequest, background_tasks: Back
     Pre-train an anomaly detector for faster scoring.
     Training happens in the background.
     """
-    def do_training(cost_data: List[Dict]):
+    def do_training(dates: np.ndarray, costs: np.ndarray, contamination: float):
         try:
-            detector = CostAnomalyDetector(contamination=request.contamination)
-            detector.fit(cost_data)
+            detector = CostAnomalyDetector(contamination=contamination)
+            detector.fit({'date': dates, 'cost': costs})
             model_cache['anomaly_detector'] = detector
             logger.info("Anomaly detector training complete")
         except Exception as e:
             logger.error(f"Background training failed: {e}")
     
-    cost_data = [
-        {"date": dp.date, "cost": dp.cost}
-        for dp in request.cost_data
-    ]
+    dates = date_array(request.cost_data)
+    costs = cost_array(request.cost_data)
     
-    background_tasks.add_task(do_training, cost_data)
+    background_tasks.add_task(do_training, dates, costs, request.contamination)
     
-    return {"status": "training_started", "data_points": len(cost_data)}
+    return {"status": "training_started", "data_points": len(costs)}
 
 
 @app.delete("/cache")
 async def clear_cache():
     """Clear all cached models and forecasts."""
-    model_cache['forecaster'] = None
-    model_cache['anomaly_detector'] = None
-    model_cache['forecast_cache'] = {}
-    model_cache['last_forecast_time'] = None
-    model_cache['last_anomaly_time'] = None
+    with model_cache_lock:
+        model_cache.update(_empty_model_cache())
     
     return {"status": "cache_cleared"}
 
 
+@app.post("/api/v1/forecast", response_model=OrgForecastResponse)
+async def forecast_organization(request: OrgForecastRequest):
+    """Forecast daily cost for an organization (Prophet, or a linear trend)."""
+    try:
+        forecasts = await run_blocking(
+            forecasting_service.forecast, request.data, request.forecast_days, request.confidence_level
+        )
+        return {
+            'organization_id': request.organization_id, 'generated_at': datetime.utcnow(),
+            'model_version': forecasting_service.model_version_for(len(request.data), request.forecast_days),
+            'forecasts': forecasts,
+            'total_forecasted': round(sum(f['predicted'] for f in forecasts), 2),
+            'confidence_level': request.confidence_level,
+        }
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@app.post("/api/v1/anomalies/detect", response_model=OrgAnomalyResponse)
+async def detect_organization_anomalies(request: OrgAnomalyRequest):
+    """Flag anomalous days for an organization (Isolation Forest, or z-score)."""
+    try:
+        anomalies = await run_blocking(anomaly_service.detect, request.data, request.sensitivity)
+        return {
+            'organization_id': request.organization_id, 'analyzed_at': datetime.utcnow(),
+            'model_version': anomaly_service.model_version, 'anomalies': anomalies,
+            'total_analyzed': len(request.data), 'anomaly_count': len(anomalies),
+            'threshold': request.sensitivity,
+        }
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
 # ==================== Main ====================
 
 if __name__ == "__main__":
@@ -373,10 +683,23 @@ if __name__ == "__main__":
     port = int(os.getenv("ML_SIDECAR_PORT", "8081"))
     host = os.getenv("ML_SIDECAR_HOST", "0.0.0.0")
     
-    uvicorn.run(
-        "main:app",
-        host=host,
-        port=port,
-        reload=os.getenv("ENVIRONMENT", "development") == "development",
-        log_level="info",
-    )
+    if os.getenv("ENVIRONMENT", "development") == "development":
+        uvicorn.run("main:app", host=host, port=port, reload=True, log_level="info")
+    else:
+        # uvloop and httptools come with uvicorn[standard]; see WORKERS for
+        # why more than one process is opt-in
+        if WORKERS > 1:
+            logger.warning(
+                "Running %d workers: trained models and caches are per process, "
+                "so scoring may not find a model trained by another worker",
+                WORKERS,
+            )
+        uvicorn.run(
+            "main:app",
+            host=host,
+            port=port,
+            workers=WORKERS,
+            loop="uvloop",
+            http="httptools",
+            log_level="info",
+        )
@@ -0,0 +1,25 @@
+"""
+Array conversion for ``{date, cost}`` points in the FinOpsMind ML sidecar.
+"""
+
+from typing import Sequence
+
+import numpy as np
+import pandas as pd
+
+
+def date_array(points: Sequence) -> np.ndarray:
+    """Point dates as a datetime64[ns] array, parsed in one call."""
+    date_strs = [p.date for p in points]
+    try:
+        # Any ISO 8601 form: YYYY-MM-DD, YYYYMMDD, with or without a time
+        dates = pd.to_datetime(date_strs, format="ISO8601")
+    except ValueError:
+        # Not ISO 8601; let pandas infer the format
+        dates = pd.to_datetime(date_strs)
+    return dates.to_numpy(dtype="datetime64[ns]")
+
+
+def cost_array(points: Sequence, dtype=np.float64) -> np.ndarray:
+    """Point costs as a ``dtype`` array, filled in one typed pass."""
+    return np.fromiter((p.cost for p in points), dtype=dtype, count=len(points))
@@ -8,10 +8,22 @@ Analyzes AWS architecture patterns and recommends modernization:
 - Event-driven refactoring opportunities
 """
 
-from dataclasses import dataclass, field
-from typing import List, Dict, Optional, Tuple
+import heapq
+from collections import defaultdict
+from dataclasses import MISSING, Field, dataclass, field, fields
+from functools import lru_cache, partial
+from operator import attrgetter
+from typing import Any, Iterator, List, Dict, Optional, Tuple, get_origin
 from enum import Enum
 
+import numpy as np
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
 
 class ResourceType(Enum):
     """AWS resource types for analysis."""
@@ -44,7 +56,7 @@ class MigrationTarget(Enum):
     API_GATEWAY_HTTP = "api_gateway_http"
 
 
-@dataclass
+@dataclass(slots=True)
 class ResourceMetrics:
     """Metrics for a resource."""
     resource_id: str
@@ -67,7 +79,7 @@ class ResourceMetrics:
     tags: Dict[str, str] = field(default_factory=dict)
 
 
-@dataclass
+@dataclass(slots=True)
 class ArchitecturePattern:
     """Detected architecture pattern."""
     pattern_name: str
@@ -78,7 +90,7 @@ class ArchitecturePattern:
     recommendations: List[str]
 
 
-@dataclass
+@dataclass(slots=True)
 class MigrationCandidate:
     """Migration candidate with analysis."""
     resource_id: str
@@ -94,7 +106,7 @@ class MigrationCandidate:
     risks: List[str]
 
 
-@dataclass
+@dataclass(slots=True)
 class ArchitectureAnalysis:
     """Complete architecture analysis result."""
     patterns_detected: List[ArchitecturePattern]
@@ -106,42 +118,245 @@ class ArchitectureAnalysis:
     warnings: List[str]
 
 
+# Migration thresholds
+AURORA_MIN_IDLE_PERCENT = 30
+AURORA_MAX_PEAK_ACU = 128
+DAX_MIN_READ_PERCENT = 80
+DAX_MIN_CACHE_HIT_RATE = 60
+
+# Messaging services that make an architecture asynchronous
+_ASYNC_TYPES = frozenset({ResourceType.SQS, ResourceType.SNS})
+
+# Managed or serverless services that count toward the modernization score
+_MODERN_TYPES = frozenset({ResourceType.LAMBDA, ResourceType.FARGATE, ResourceType.DYNAMODB})
+
+# Compute and database tiers of a monolithic deployment
+_MONOLITH_TYPES = frozenset({ResourceType.EC2, ResourceType.RDS})
+
+# Recommendation names of the migration targets
+_TARGET_NAMES = {t: t.value for t in MigrationTarget}
+
+# EC2 containerization reasons, by bit position in the reason mask
+_EC2_REASONS = (
+    "Low CPU utilization suitable for right-sizing",
+    "Web/API workload suitable for containers",
+    "High connection count indicates service workload",
+)
+
+# Numeric fields the RDS and EC2 scoring reads as one array per bucket
+_SCORED_METRICS = ("avg_cpu_percent", "avg_memory_percent", "avg_connections", "max_connections", "monthly_cost")
+
+# Resource types whose candidates are scored over those arrays
+_SCORED_TYPES = (ResourceType.RDS, ResourceType.EC2)
+
+# RDS engines Aurora Serverless can take over
+_COMPATIBLE_ENGINES = frozenset({"mysql", "postgresql", "aurora-mysql", "aurora-postgresql"})
+
+
+@lru_cache(maxsize=256)
+def _engine_compat(engine: str) -> bool:
+    """Whether Aurora Serverless can take over an RDS ``engine`` (any case)."""
+    return engine.lower() in _COMPATIBLE_ENGINES
+
+
+@lru_cache(maxsize=256)
+def _is_aurora(engine: str) -> bool:
+    """Whether an RDS ``engine`` is already an Aurora flavour (any case)."""
+    return "aurora" in engine.lower()
+
+
+def _metric_array(resources: List[ResourceMetrics], name: str) -> np.ndarray:
+    """One metric across ``resources`` as a float64 array."""
+    return np.fromiter((getattr(r, name) for r in resources), dtype=np.float64, count=len(resources))
+
+
+def _metric_columns(resources: List[ResourceMetrics]) -> Dict[str, np.ndarray]:
+    """The scored metrics of ``resources``, one float64 array each."""
+    return {name: _metric_array(resources, name) for name in _SCORED_METRICS}
+
+
+def _as_float(value: Any) -> float:
+    """``value`` as a float, or NaN for missing markers float() rejects (None, pd.NA)."""
+    try:
+        return float(value)
+    except TypeError:
+        return np.nan
+
+
+def _numeric_column(frame: Any, name: str) -> np.ndarray:
+    """A numeric column as float64, with missing entries (None, NaN, NA) as NaN."""
+    column = frame[name]
+    try:
+        values = np.asarray(column, dtype=np.float64)
+    except TypeError:
+        # Object column holding pd.NA or similar; convert entry by entry
+        values = np.fromiter((_as_float(v) for v in column), dtype=np.float64, count=len(column))
+    return values
+
+
+def _object_column(frame: Any, f: Field, n: int) -> list:
+    """A str, list or dict column, with entries of any other type (None, NaN) set to the field default."""
+    kind = get_origin(f.type) or f.type
+    default = f.default_factory if f.default is MISSING else lambda: f.default
+    if f.name not in frame:
+        return [default() for _ in range(n)]
+    return [v if isinstance(v, kind) else default() for v in frame[f.name]]
+
+
+def _score_rds_numpy(cpu, memory, avg_connections, max_connections, monthly_cost):
+    """
+    Aurora Serverless scoring for a batch of databases with compatible engines.
+    
+    Returns the low-CPU and variable-connection masks, confidence, savings
+    percent and monthly savings, one entry per database.
+    """
+    low_cpu = cpu < 30
+    variable_connections = (max_connections - avg_connections) / np.maximum(avg_connections, 1) > 2
+    
+    # A compatible engine is always a reason for; high CPU the only reason against
+    reasons_for_count = low_cpu.astype(np.int64) + variable_connections + 1
+    reasons_against_count = (~low_cpu).astype(np.int64)
+    confidence = reasons_for_count / (reasons_for_count + reasons_against_count + 1)
+    
+    avg_utilization = (cpu + memory) / 2 / 100
+    potential_savings_percent = np.maximum(0, (1 - avg_utilization) * 50)
+    monthly_savings = monthly_cost * (potential_savings_percent / 100)
+    return low_cpu, variable_connections, confidence, potential_savings_percent, monthly_savings
+
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True)
+    def _score_rds(cpu, memory, avg_connections, max_connections, monthly_cost):
+        """Single-pass compiled equivalent of `_score_rds_numpy`."""
+        n = cpu.shape[0]
+        low_cpu = np.zeros(n, dtype=np.bool_)
+        variable_connections = np.zeros(n, dtype=np.bool_)
+        confidence = np.zeros(n, dtype=np.float64)
+        potential_savings_percent = np.zeros(n, dtype=np.float64)
+        monthly_savings = np.zeros(n, dtype=np.float64)
+        for i in range(n):
+            low = cpu[i] < 30
+            variable = (max_connections[i] - avg_connections[i]) / max(avg_connections[i], 1.0) > 2
+            reasons_for = 1 + (1 if low else 0) + (1 if variable else 0)
+            reasons_against = 0 if low else 1
+            low_cpu[i] = low
+            variable_connections[i] = variable
+            confidence[i] = reasons_for / (reasons_for + reasons_against + 1)
+            avg_utilization = (cpu[i] + memory[i]) / 2 / 100
+            potential_savings_percent[i] = max(0.0, (1 - avg_utilization) * 50)
+            monthly_savings[i] = monthly_cost[i] * (potential_savings_percent[i] / 100)
+        return low_cpu, variable_connections, confidence, potential_savings_percent, monthly_savings
+else:
+    _score_rds = _score_rds_numpy
+
+
+def _bucket_by_type(resources: List[ResourceMetrics]) -> Dict[ResourceType, List[ResourceMetrics]]:
+    """Group resources by type in one pass, keeping input order within each type."""
+    buckets = defaultdict(list)
+    for r in resources:
+        buckets[r.resource_type].append(r)
+    return buckets
+
+
 class ArchitectureAnalyzer:
     """Analyzes AWS architecture for modernization opportunities."""
     
-    AURORA_MIN_IDLE_PERCENT = 30
-    AURORA_MAX_PEAK_ACU = 128
-    DAX_MIN_READ_PERCENT = 80
-    DAX_MIN_CACHE_HIT_RATE = 60
+    # Module-level thresholds, also exposed on the class for existing callers
+    AURORA_MIN_IDLE_PERCENT = AURORA_MIN_IDLE_PERCENT
+    AURORA_MAX_PEAK_ACU = AURORA_MAX_PEAK_ACU
+    DAX_MIN_READ_PERCENT = DAX_MIN_READ_PERCENT
+    DAX_MIN_CACHE_HIT_RATE = DAX_MIN_CACHE_HIT_RATE
     
     def __init__(self, config: Optional[Dict] = None):
         self.config = config or {}
     
     def analyze(self, resources: List[ResourceMetrics], dependencies: Optional[Dict[str, List[str]]] = None) -> ArchitectureAnalysis:
+        buckets = _bucket_by_type(resources)
+        metrics = {t: _metric_columns(buckets[t]) for t in _SCORED_TYPES if buckets.get(t)}
+        return self._analyze(resources, buckets, metrics, dependencies)
+    
+    def analyze_df(self, frame: Any, dependencies: Optional[Dict[str, List[str]]] = None) -> ArchitectureAnalysis:
+        """
+        Analyze an inventory held column-wise.
+        
+        Numeric columns are read once as float64 arrays and the RDS and EC2
+        scoring runs on slices of them; missing values (None, NaN, NA) and
+        missing columns take the ResourceMetrics field defaults.
+        
+        Args:
+            frame: pandas or Polars DataFrame, or a dict of equal-length
+                sequences, with one column per ResourceMetrics field.
+                resource_type may hold ResourceType members or their string
+                values.
+            dependencies: Resource ID -> IDs it depends on
+            
+        Returns:
+            The same ArchitectureAnalysis as analyze() on the equivalent
+            ResourceMetrics
+        """
+        types = [ResourceType(t) for t in frame["resource_type"]]
+        n = len(types)
+        columns = {"resource_id": list(frame["resource_id"]), "resource_type": types}
+        arrays = {}
+        for f in fields(ResourceMetrics)[2:]:
+            if f.type not in (float, int, bool):
+                columns[f.name] = _object_column(frame, f, n)
+            elif f.name in frame:
+                values = _numeric_column(frame, f.name)
+                missing = np.isnan(values)
+                arrays[f.name] = np.where(missing, f.default, values)
+                columns[f.name] = arrays[f.name].astype(f.type).tolist()
+                for i in np.flatnonzero(missing):
+                    columns[f.name][i] = f.default
+            else:
+                arrays[f.name] = np.full(n, f.default, dtype=np.float64)
+                columns[f.name] = [f.default] * n
+        resources = [ResourceMetrics(*row) for row in zip(*columns.values())]
+        
+        positions = defaultdict(list)
+        for i, t in enumerate(types):
+            positions[t].append(i)
+        buckets = {t: [resources[i] for i in idx] for t, idx in positions.items()}
+        metrics = {
+            t: {name: arrays[name][positions[t]] for name in _SCORED_METRICS}
+            for t in _SCORED_TYPES if t in positions
+        }
+        return self._analyze(resources, buckets, metrics, dependencies)
+    
+    def _analyze(
+        self,
+        resources: List[ResourceMetrics],
+        buckets: Dict[ResourceType, List[ResourceMetrics]],
+        metrics: Dict[ResourceType, Dict[str, np.ndarray]],
+        dependencies: Optional[Dict[str, List[str]]],
+    ) -> ArchitectureAnalysis:
         dependencies = dependencies or {}
-        patterns = self._detect_patterns(resources, dependencies)
+        out_degree = {rid: len(deps) for rid, deps in dependencies.items()}
+        patterns = self._detect_patterns(resources, buckets, dependencies)
+        
+        # One pass over the migratable types, each bucket scored by its handler
+        handlers = (
+            (ResourceType.RDS, partial(self._analyze_rds_migrations, metrics=metrics.get(ResourceType.RDS))),
+            (ResourceType.ELASTICACHE, partial(self._analyze_cache_migrations, has_dynamodb=bool(buckets.get(ResourceType.DYNAMODB)))),
+            (ResourceType.EC2, partial(self._analyze_ec2_modernizations, metrics=metrics.get(ResourceType.EC2), out_degree=out_degree)),
+        )
         candidates = []
-        
-        for rds in [r for r in resources if r.resource_type == ResourceType.RDS]:
-            candidate = self._analyze_rds_migration(rds)
-            if candidate:
+        total_savings = 0
+        high_complexity = 0
+        for resource_type, handler in handlers:
+            bucket = buckets.get(resource_type)
+            if not bucket:
+                continue
+            for candidate in handler(bucket):
                 candidates.append(candidate)
+                total_savings += candidate.estimated_savings_monthly
+                if candidate.migration_complexity == "high":
+                    high_complexity += 1
         
-        for cache in [r for r in resources if r.resource_type == ResourceType.ELASTICACHE]:
-            candidate = self._analyze_cache_migration(cache, resources)
-            if candidate:
-                candidates.append(candidate)
-        
-        for ec2 in [r for r in resources if r.resource_type == ResourceType.EC2]:
-            candidate = self._analyze_ec2_modernization(ec2, dependencies)
-            if candidate:
-                candidates.append(candidate)
-        
-        refactoring = self._find_refactoring_opportunities(resources, dependencies)
-        total_savings = sum(c.estimated_savings_monthly for c in candidates)
-        modernization_score = self._calculate_modernization_score(resources, patterns)
+        refactoring = self._find_refactoring_opportunities(buckets, out_degree)
+        modernization_score = self._calculate_modernization_score(buckets, patterns)
         recommendations = self._generate_recommendations(patterns, candidates, refactoring)
-        warnings = self._generate_warnings(resources, candidates)
+        warnings = self._generate_warnings(resources, high_complexity)
         
         return ArchitectureAnalysis(
             patterns_detected=patterns,
@@ -153,17 +368,17 @@ class ArchitectureAnalyzer:
             warnings=warnings,
         )
     
-    def _detect_patterns(self, resources: List[ResourceMetrics], dependencies: Dict[str, List[str]]) -> List[ArchitecturePattern]:
+    def _detect_patterns(self, resources: List[ResourceMetrics], buckets: Dict[ResourceType, List[ResourceMetrics]], dependencies: Dict[str, List[str]]) -> List[ArchitecturePattern]:
         patterns = []
-        ec2_count = len([r for r in resources if r.resource_type == ResourceType.EC2])
-        has_single_alb = len([r for r in resources if r.resource_type == ResourceType.ALB]) == 1
-        has_single_rds = len([r for r in resources if r.resource_type == ResourceType.RDS]) == 1
+        ec2_count = len(buckets.get(ResourceType.EC2, ()))
+        has_single_alb = len(buckets.get(ResourceType.ALB, ())) == 1
+        has_single_rds = len(buckets.get(ResourceType.RDS, ())) == 1
         
         if ec2_count <= 3 and has_single_alb and has_single_rds:
             patterns.append(ArchitecturePattern(
                 pattern_name="Monolithic Architecture",
                 description="Single-tier application with centralized database",
-                resources_involved=[r.resource_id for r in resources if r.resource_type in [ResourceType.EC2, ResourceType.RDS]],
+                resources_involved=[r.resource_id for r in resources if r.resource_type in _MONOLITH_TYPES],
                 confidence=0.8,
                 modernization_opportunity=True,
                 recommendations=[
@@ -173,8 +388,8 @@ class ArchitectureAnalyzer:
                 ],
             ))
         
-        lambdas = [r for r in resources if r.resource_type == ResourceType.LAMBDA]
-        if len(lambdas) > 5 and not any(r.resource_type in [ResourceType.SQS, ResourceType.SNS] for r in resources):
+        lambdas = buckets.get(ResourceType.LAMBDA, ())
+        if len(lambdas) > 5 and not any(buckets.get(t) for t in _ASYNC_TYPES):
             patterns.append(ArchitecturePattern(
                 pattern_name="Synchronous API Chain",
                 description="Multiple Lambda functions without async messaging",
@@ -188,7 +403,7 @@ class ArchitectureAnalyzer:
                 ],
             ))
         
-        overprovisioned_dbs = [r.resource_id for r in resources if r.resource_type == ResourceType.RDS and r.avg_cpu_percent < 20 and r.avg_connections < 50]
+        overprovisioned_dbs = [r.resource_id for r in buckets.get(ResourceType.RDS, ()) if r.avg_cpu_percent < 20 and r.avg_connections < 50]
         if overprovisioned_dbs:
             patterns.append(ArchitecturePattern(
                 pattern_name="Over-provisioned Databases",
@@ -205,123 +420,131 @@ class ArchitectureAnalyzer:
         
         return patterns
     
-    def _analyze_rds_migration(self, rds: ResourceMetrics) -> Optional[MigrationCandidate]:
-        reasons_for = []
-        reasons_against = []
-        
-        if rds.avg_cpu_percent < 30:
-            reasons_for.append("Low average CPU utilization")
-        else:
-            reasons_against.append("Consistent high CPU usage")
-        
-        connection_variance = (rds.max_connections - rds.avg_connections) / max(rds.avg_connections, 1)
-        if connection_variance > 2:
-            reasons_for.append("Variable connection patterns")
+    def _analyze_rds_migrations(self, databases: List[ResourceMetrics], metrics: Dict[str, np.ndarray]) -> List[MigrationCandidate]:
+        # Unsupported engines are never candidates, so drop them before scoring
+        keep = [i for i, r in enumerate(databases) if _engine_compat(r.engine)]
+        if not keep:
+            return []
+        databases = [databases[i] for i in keep]
+        
+        # Score every database at once; only those that qualify become candidates
+        low_cpu, variable_connections, confidence, potential_savings_percent, monthly_savings = _score_rds(
+            metrics["avg_cpu_percent"][keep],
+            metrics["avg_memory_percent"][keep],
+            metrics["avg_connections"][keep],
+            metrics["max_connections"][keep],
+            metrics["monthly_cost"][keep],
+        )
         
-        compatible_engines = ["mysql", "postgresql", "aurora-mysql", "aurora-postgresql"]
-        if rds.engine.lower() in compatible_engines:
+        candidates = []
+        for i in np.flatnonzero(confidence >= 0.5):
+            rds = databases[i]
+            reasons_for = []
+            reasons_against = []
+            if low_cpu[i]:
+                reasons_for.append("Low average CPU utilization")
+            else:
+                reasons_against.append("Consistent high CPU usage")
+            if variable_connections[i]:
+                reasons_for.append("Variable connection patterns")
             reasons_for.append(f"Compatible engine ({rds.engine})")
-        else:
-            reasons_against.append(f"Engine {rds.engine} not supported by Aurora Serverless")
-            return None
-        
-        confidence = len(reasons_for) / (len(reasons_for) + len(reasons_against) + 1)
-        if confidence < 0.5:
-            return None
-        
-        avg_utilization = (rds.avg_cpu_percent + rds.avg_memory_percent) / 2 / 100
-        potential_savings_percent = max(0, (1 - avg_utilization) * 50)
-        monthly_savings = rds.monthly_cost * (potential_savings_percent / 100)
-        
-        complexity = "high" if rds.multi_az or rds.read_replicas > 0 else ("low" if "aurora" in rds.engine.lower() else "medium")
-        
-        return MigrationCandidate(
-            resource_id=rds.resource_id,
-            resource_type=ResourceType.RDS,
-            current_config=f"{rds.engine} - {rds.storage_gb}GB",
-            recommended_target=MigrationTarget.AURORA_SERVERLESS,
-            confidence=confidence,
-            estimated_savings_percent=potential_savings_percent,
-            estimated_savings_monthly=monthly_savings,
-            migration_complexity=complexity,
-            prerequisites=["Verify application compatibility with Aurora", "Test connection handling with serverless scaling", "Plan for maintenance window"],
-            benefits=reasons_for + ["Pay-per-use pricing for variable workloads", "Automatic scaling to handle peaks", "Reduced operational overhead"],
-            risks=["Cold start latency after idle periods", "Different connection pooling behavior", "Potential compatibility issues with some features"] + reasons_against,
-        )
+            
+            complexity = "high" if rds.multi_az or rds.read_replicas > 0 else ("low" if _is_aurora(rds.engine) else "medium")
+            
+            candidates.append(MigrationCandidate(
+                resource_id=rds.resource_id,
+                resource_type=ResourceType.RDS,
+                current_config=f"{rds.engine} - {rds.storage_gb}GB",
+                recommended_target=MigrationTarget.AURORA_SERVERLESS,
+                confidence=float(confidence[i]),
+                estimated_savings_percent=float(potential_savings_percent[i]),
+                estimated_savings_monthly=float(monthly_savings[i]),
+                migration_complexity=complexity,
+                prerequisites=["Verify application compatibility with Aurora", "Test connection handling with serverless scaling", "Plan for maintenance window"],
+                benefits=reasons_for + ["Pay-per-use pricing for variable workloads", "Automatic scaling to handle peaks", "Reduced operational overhead"],
+                risks=["Cold start latency after idle periods", "Different connection pooling behavior", "Potential compatibility issues with some features"] + reasons_against,
+            ))
+        return candidates
     
-    def _analyze_cache_migration(self, cache: ResourceMetrics, all_resources: List[ResourceMetrics]) -> Optional[MigrationCandidate]:
-        has_dynamodb = any(r.resource_type == ResourceType.DYNAMODB for r in all_resources)
+    def _analyze_cache_migrations(self, caches: List[ResourceMetrics], has_dynamodb: bool) -> List[MigrationCandidate]:
+        # DAX only fronts DynamoDB
         if not has_dynamodb:
-            return None
-        
-        reasons_for = []
-        if cache.cache_hits_percent > self.DAX_MIN_CACHE_HIT_RATE:
-            reasons_for.append(f"Good cache hit rate ({cache.cache_hits_percent:.0f}%)")
-        
-        if "redis" in cache.tags.get("engine", "").lower():
-            reasons_for.append("Redis cluster can potentially migrate to DAX")
-        
-        confidence = 0.6 if has_dynamodb else 0.3
-        if not reasons_for:
-            return None
-        
-        potential_savings_percent = 25
-        monthly_savings = cache.monthly_cost * (potential_savings_percent / 100)
+            return []
         
-        return MigrationCandidate(
-            resource_id=cache.resource_id,
-            resource_type=ResourceType.ELASTICACHE,
-            current_config=f"ElastiCache - {cache.tags.get('engine', 'Unknown')}",
-            recommended_target=MigrationTarget.DAX,
-            confidence=confidence,
-            estimated_savings_percent=potential_savings_percent,
-            estimated_savings_monthly=monthly_savings,
-            migration_complexity="medium",
-            prerequisites=["Verify all cached data is from DynamoDB", "Update application to use DAX client", "Test read/write consistency requirements"],
-            benefits=reasons_for + ["Native DynamoDB integration", "Automatic cache invalidation", "Microsecond response times"],
-            risks=["DAX-specific client required", "Different consistency model", "Limited to DynamoDB use cases"],
-        )
+        candidates = []
+        for cache in caches:
+            reasons_for = []
+            if cache.cache_hits_percent > DAX_MIN_CACHE_HIT_RATE:
+                reasons_for.append(f"Good cache hit rate ({cache.cache_hits_percent:.0f}%)")
+            
+            if "redis" in cache.tags.get("engine", "").lower():
+                reasons_for.append("Redis cluster can potentially migrate to DAX")
+            
+            if not reasons_for:
+                continue
+            
+            potential_savings_percent = 25
+            monthly_savings = cache.monthly_cost * (potential_savings_percent / 100)
+            
+            candidates.append(MigrationCandidate(
+                resource_id=cache.resource_id,
+                resource_type=ResourceType.ELASTICACHE,
+                current_config=f"ElastiCache - {cache.tags.get('engine', 'Unknown')}",
+                recommended_target=MigrationTarget.DAX,
+                confidence=0.6,
+                estimated_savings_percent=potential_savings_percent,
+                estimated_savings_monthly=monthly_savings,
+                migration_complexity="medium",
+                prerequisites=["Verify all cached data is from DynamoDB", "Update application to use DAX client", "Test read/write consistency requirements"],
+                benefits=reasons_for + ["Native DynamoDB integration", "Automatic cache invalidation", "Microsecond response times"],
+                risks=["DAX-specific client required", "Different consistency model", "Limited to DynamoDB use cases"],
+            ))
+        return candidates
     
-    def _analyze_ec2_modernization(self, ec2: ResourceMetrics, dependencies: Dict[str, List[str]]) -> Optional[MigrationCandidate]:
-        reasons_for = []
-        
-        if ec2.avg_cpu_percent < 30:
-            reasons_for.append("Low CPU utilization suitable for right-sizing")
+    def _analyze_ec2_modernizations(self, instances: List[ResourceMetrics], metrics: Dict[str, np.ndarray], out_degree: Dict[str, int]) -> List[MigrationCandidate]:
+        if not instances:
+            return []
         
-        if "web" in ec2.tags.get("role", "").lower() or "api" in ec2.tags.get("role", "").lower():
-            reasons_for.append("Web/API workload suitable for containers")
+        cpu = metrics["avg_cpu_percent"]
+        low_cpu = cpu < 30
+        roles = [r.tags.get("role", "").lower() for r in instances]
+        service_role = np.array(["web" in role or "api" in role for role in roles], dtype=bool)
+        high_connections = metrics["avg_connections"] > 100
         
-        if ec2.avg_connections > 100:
-            reasons_for.append("High connection count indicates service workload")
+        avg_utilization = cpu / 100
+        potential_savings_percent = np.maximum(0, (1 - avg_utilization) * 35)
+        monthly_savings = metrics["monthly_cost"] * (potential_savings_percent / 100)
         
-        target = MigrationTarget.EKS if len(dependencies.get(ec2.resource_id, [])) > 3 else MigrationTarget.FARGATE
-        complexity = "high" if target == MigrationTarget.EKS else "medium"
+        # One bit per reason; confidence is reasons/4, so any set bit clears the 0.25 bar
+        reason_bits = low_cpu.astype(np.int64) | (service_role.astype(np.int64) << 1) | (high_connections.astype(np.int64) << 2)
         
-        confidence = len(reasons_for) / 4
-        if confidence < 0.25:
-            return None
-        
-        avg_utilization = ec2.avg_cpu_percent / 100
-        potential_savings_percent = max(0, (1 - avg_utilization) * 35)
-        monthly_savings = ec2.monthly_cost * (potential_savings_percent / 100)
-        
-        return MigrationCandidate(
-            resource_id=ec2.resource_id,
-            resource_type=ResourceType.EC2,
-            current_config=f"EC2 - {ec2.tags.get('instance_type', 'Unknown')}",
-            recommended_target=target,
-            confidence=confidence,
-            estimated_savings_percent=potential_savings_percent,
-            estimated_savings_monthly=monthly_savings,
-            migration_complexity=complexity,
-            prerequisites=["Containerize application (Docker)", "Define resource requirements", "Set up container registry (ECR)", "Configure networking (VPC, security groups)"],
-            benefits=reasons_for + ["Improved deployment flexibility", "Better resource utilization", "Simplified scaling"],
-            risks=["Application may require refactoring", "Learning curve for container orchestration", "Initial migration effort"],
-        )
+        candidates = []
+        for i in np.flatnonzero(reason_bits):
+            ec2 = instances[i]
+            bits = int(reason_bits[i])
+            reasons_for = [reason for bit, reason in enumerate(_EC2_REASONS) if bits >> bit & 1]
+            
+            target = MigrationTarget.EKS if out_degree.get(ec2.resource_id, 0) > 3 else MigrationTarget.FARGATE
+            complexity = "high" if target is MigrationTarget.EKS else "medium"
+            
+            candidates.append(MigrationCandidate(
+                resource_id=ec2.resource_id,
+                resource_type=ResourceType.EC2,
+                current_config=f"EC2 - {ec2.tags.get('instance_type', 'Unknown')}",
+                recommended_target=target,
+                confidence=bits.bit_count() / 4,
+                estimated_savings_percent=float(potential_savings_percent[i]),
+                estimated_savings_monthly=float(monthly_savings[i]),
+                migration_complexity=complexity,
+                prerequisites=["Containerize application (Docker)", "Define resource requirements", "Set up container registry (ECR)", "Configure networking (VPC, security groups)"],
+                benefits=reasons_for + ["Improved deployment flexibility", "Better resource utilization", "Simplified scaling"],
+                risks=["Application may require refactoring", "Learning curve for container orchestration", "Initial migration effort"],
+            ))
+        return candidates
     
-    def _find_refactoring_opportunities(self, resources: List[ResourceMetrics], dependencies: Dict[str, List[str]]) -> List[Dict]:
+    def _find_refactoring_opportunities(self, buckets: Dict[ResourceType, List[ResourceMetrics]], out_degree: Dict[str, int]) -> List[Dict]:
         opportunities = []
-        tightly_coupled = [rid for rid, deps in dependencies.items() if len(deps) > 3]
+        tightly_coupled = [rid for rid, degree in out_degree.items() if degree > 3]
         
         if tightly_coupled:
             opportunities.append({
@@ -332,7 +555,7 @@ class ArchitectureAnalyzer:
                 "estimated_effort": "high",
             })
         
-        lambdas = [r for r in resources if r.resource_type == ResourceType.LAMBDA]
+        lambdas = buckets.get(ResourceType.LAMBDA, ())
         if len(lambdas) > 10:
             opportunities.append({
                 "type": "api_consolidation",
@@ -344,14 +567,12 @@ class ArchitectureAnalyzer:
         
         return opportunities
     
-    def _calculate_modernization_score(self, resources: List[ResourceMetrics], patterns: List[ArchitecturePattern]) -> float:
+    def _calculate_modernization_score(self, buckets: Dict[ResourceType, List[ResourceMetrics]], patterns: List[ArchitecturePattern]) -> float:
         score = 50
-        modern_types = [ResourceType.LAMBDA, ResourceType.FARGATE, ResourceType.DYNAMODB]
-        modern_count = len([r for r in resources if r.resource_type in modern_types])
+        modern_count = sum(len(buckets.get(t, ())) for t in _MODERN_TYPES)
         score += min(modern_count * 5, 25)
         
-        event_types = [ResourceType.SQS, ResourceType.SNS]
-        event_count = len([r for r in resources if r.resource_type in event_types])
+        event_count = sum(len(buckets.get(t, ())) for t in _ASYNC_TYPES)
         score += min(event_count * 3, 15)
         
         modernization_patterns = [p for p in patterns if p.modernization_opportunity]
@@ -360,30 +581,37 @@ class ArchitectureAnalyzer:
         return max(0, min(100, score))
     
     def _generate_recommendations(self, patterns: List[ArchitecturePattern], candidates: List[MigrationCandidate], refactoring: List[Dict]) -> List[str]:
-        recommendations = []
-        
-        for c in [c for c in candidates if c.confidence > 0.7][:3]:
-            recommendations.append(f"Consider migrating {c.resource_id} to {c.recommended_target.value} (estimated ${c.estimated_savings_monthly:.0f}/month savings)")
+        # Deduplicate as recommendations are produced and stop at the first ten distinct ones
+        recommendations = {}
+        for rec in self._iter_recommendations(patterns, candidates, refactoring):
+            recommendations[rec] = None
+            if len(recommendations) >= 10:
+                break
+        return list(recommendations)
+    
+    def _iter_recommendations(self, patterns: List[ArchitecturePattern], candidates: List[MigrationCandidate], refactoring: List[Dict]) -> Iterator[str]:
+        # The three most confident candidates, in input order among equal confidence
+        for c in heapq.nlargest(3, candidates, key=attrgetter("confidence")):
+            if c.confidence <= 0.7:
+                break
+            yield f"Consider migrating {c.resource_id} to {_TARGET_NAMES[c.recommended_target]} (estimated ${c.estimated_savings_monthly:.0f}/month savings)"
         
         for pattern in patterns:
             if pattern.modernization_opportunity:
-                recommendations.extend(pattern.recommendations[:2])
+                yield from pattern.recommendations[:2]
         
         for opp in refactoring:
-            recommendations.extend(opp["recommendations"][:1])
-        
-        return list(dict.fromkeys(recommendations))[:10]
+            yield from opp["recommendations"][:1]
     
-    def _generate_warnings(self, resources: List[ResourceMetrics], candidates: List[MigrationCandidate]) -> List[str]:
+    def _generate_warnings(self, resources: List[ResourceMetrics], high_complexity: int) -> List[str]:
         warnings = []
         
-        high_complexity = [c for c in candidates if c.migration_complexity == "high"]
         if high_complexity:
-            warnings.append(f"{len(high_complexity)} migration candidates have high complexity - recommend thorough testing")
+            warnings.append(f"{high_complexity} migration candidates have high complexity - recommend thorough testing")
         
-        missing_metrics = [r for r in resources if r.avg_cpu_percent == 0]
+        missing_metrics = sum(1 for r in resources if r.avg_cpu_percent == 0)
         if missing_metrics:
-            warnings.append(f"{len(missing_metrics)} resources have incomplete metrics - analysis may be limited")
+            warnings.append(f"{missing_metrics} resources have incomplete metrics - analysis may be limited")
         
         return warnings
 
@@ -1,27 +1,44 @@
-from .workload import (
-    WorkloadClassifier,
-    WorkloadClassification,
-    ClassificationResult,
-    CloudWatchMetrics,
-    MetricDataPoint,
-    classify_workloads,
-)
-from .patterns import (
-    PatternDetector,
-    PatternAnalysis,
-    PatternType,
-    IdlePattern,
-    BurstPattern,
-    DiurnalPattern,
-    WeeklyPattern,
-    MemoryPattern,
-    TrendPattern,
-    MetricPoint,
-)
+import importlib
+
+# Submodule defining each public name; a submodule is imported on first
+# access to one of its names (PEP 562), so importing the package stays cheap
+_EXPORTS = {
+    "WorkloadClassifier": ".workload",
+    "WorkloadClassification": ".workload",
+    "ClassificationResult": ".workload",
+    "CloudWatchMetrics": ".workload",
+    "MetricDataPoint": ".workload",
+    "MetricSeries": ".workload",
+    "classify_workloads": ".workload",
+    "PatternDetector": ".patterns",
+    "PatternAnalysis": ".patterns",
+    "PatternType": ".patterns",
+    "IdlePattern": ".patterns",
+    "BurstPattern": ".patterns",
+    "DiurnalPattern": ".patterns",
+    "WeeklyPattern": ".patterns",
+    "MemoryPattern": ".patterns",
+    "TrendPattern": ".patterns",
+    "MetricPoint": ".patterns",
+}
 __all__ = [
     "WorkloadClassifier", "WorkloadClassification", "ClassificationResult",
-    "CloudWatchMetrics", "MetricDataPoint", "classify_workloads",
+    "CloudWatchMetrics", "MetricDataPoint", "MetricSeries", "classify_workloads",
     "PatternDetector", "PatternAnalysis", "PatternType", "IdlePattern",
     "BurstPattern", "DiurnalPattern", "WeeklyPattern", "MemoryPattern",
     "TrendPattern", "MetricPoint",
 ]
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    # Cache on the package so later lookups skip this hook
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
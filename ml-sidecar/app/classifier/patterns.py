@@ -9,12 +9,26 @@ Analyzes CloudWatch metrics to detect specific usage patterns:
 - Diurnal/weekly cycles
 """
 
+from collections import OrderedDict
+from copy import deepcopy
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from typing import List, Dict, Optional, Tuple
 from enum import Enum
-import statistics
+import hashlib
 import math
+import threading
+
+import numpy as np
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+# Analyses kept per detector, keyed by a digest of the inputs
+RESULT_CACHE_SIZE = 1024
 
 
 class PatternType(Enum):
@@ -30,6 +44,21 @@ class PatternType(Enum):
     ERRATIC = "erratic"              # No clear pattern
 
 
+# Candidate primary patterns, in tie-break order (earliest wins), and their
+# slots in the score list built by `_determine_primary_pattern`
+_SCORED_PATTERNS = (
+    PatternType.IDLE_DOMINANT,
+    PatternType.BURSTY,
+    PatternType.STEADY_STATE,
+    PatternType.DIURNAL,
+    PatternType.WEEKLY,
+    PatternType.BATCH,
+    PatternType.GROWING,
+    PatternType.DECLINING,
+)
+_IDLE, _BURSTY, _STEADY, _DIURNAL, _WEEKLY, _BATCH, _GROWING, _DECLINING = range(len(_SCORED_PATTERNS))
+
+
 @dataclass
 class MetricPoint:
     """Single metric data point."""
@@ -37,6 +66,362 @@ class MetricPoint:
     value: float
 
 
+@dataclass
+class _MetricArrays:
+    """Column view of a metric series, built once per analysis by `_to_soa`."""
+    values: np.ndarray      # float64 metric values
+    timestamps: np.ndarray  # datetime64[us] on a common (UTC) axis, for durations
+    wall: np.ndarray        # datetime64[us] on each point's own clock
+    hours: np.ndarray       # int64 hour of day on each point's own clock
+    weekdays: np.ndarray    # int64 day of week, Monday=0
+    days: np.ndarray        # int64 calendar day number
+
+
+def _to_soa(metrics: List["MetricPoint"]) -> _MetricArrays:
+    """Convert metric points into NumPy columns in one pass over the objects."""
+    values = np.fromiter((p.value for p in metrics), dtype=np.float64, count=len(metrics))
+    if metrics and metrics[0].timestamp.tzinfo is not None:
+        # Calendar fields follow each point's wall clock, as datetime.hour does;
+        # durations use the UTC instant, as subtracting aware datetimes does
+        wall = np.array([p.timestamp.replace(tzinfo=None) for p in metrics], dtype="datetime64[us]")
+        offsets = np.array([p.timestamp.utcoffset() for p in metrics], dtype="timedelta64[us]")
+        timestamps = wall - offsets
+    else:
+        wall = timestamps = np.array([p.timestamp for p in metrics], dtype="datetime64[us]")
+    days = wall.astype("datetime64[D]").astype(np.int64)
+    return _MetricArrays(
+        values=values,
+        timestamps=timestamps,
+        wall=wall,
+        hours=wall.astype("datetime64[h]").astype(np.int64) % 24,
+        weekdays=(days + 3) % 7,  # 1970-01-01 was a Thursday
+        days=days,
+    )
+
+
+def _runs_numpy(mask: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Locate runs of True in a boolean mask.
+    
+    Returns (starts, stops) index arrays; each run covers starts[i]:stops[i].
+    """
+    padded = np.concatenate(([False], mask, [False])).astype(np.int8)
+    edges = np.flatnonzero(np.diff(padded))
+    return edges[0::2], edges[1::2]
+
+
+def _run_peaks_numpy(values: np.ndarray, starts: np.ndarray, stops: np.ndarray) -> np.ndarray:
+    """Maximum of values[starts[i]:stops[i]] for each run."""
+    if not len(starts):
+        return values[:0]
+    # Reduce over alternating run/gap segments; the sentinel lets a run end the series
+    bounds = np.column_stack((starts, stops)).ravel()
+    return np.maximum.reduceat(np.append(values, -np.inf), bounds)[::2]
+
+
+@dataclass
+class _RunScan:
+    """Idle and burst runs of a CPU series, gathered in one pass by `_scan_runs`."""
+    idle_count: int
+    idle_starts: np.ndarray
+    idle_stops: np.ndarray
+    burst_starts: np.ndarray
+    burst_stops: np.ndarray
+    burst_peaks: np.ndarray
+
+
+def _scan_runs_numpy(values: np.ndarray, idle_threshold: float, burst_threshold: float):
+    """Fields of `_RunScan` for values below idle_threshold / above burst_threshold."""
+    idle_mask = values < idle_threshold
+    idle_starts, idle_stops = _runs_numpy(idle_mask)
+    burst_starts, burst_stops = _runs_numpy(values > burst_threshold)
+    burst_peaks = _run_peaks_numpy(values, burst_starts, burst_stops)
+    return int(np.count_nonzero(idle_mask)), idle_starts, idle_stops, burst_starts, burst_stops, burst_peaks
+
+
+if NUMBA_AVAILABLE:
+    # Explicit signatures compile at import (or load from the on-disk cache),
+    # so the first request doesn't pay for JIT compilation
+    @njit(
+        "UniTuple(int64, 3)(float64[:], float64, float64, int64[:], int64[:], int64[:], int64[:], float64[:])",
+        cache=True,
+    )
+    def _scan_into(values, idle_threshold, burst_threshold, idle_starts, idle_stops, burst_starts, burst_stops, burst_peaks):
+        """
+        The scan behind `_scan_runs`, writing runs into caller-provided buffers.
+        
+        Each buffer needs room for len(values) // 2 + 1 runs. Returns the idle
+        count and the numbers of idle and burst runs written.
+        """
+        n = values.shape[0]
+        idle_count = 0
+        idle_runs = 0
+        burst_runs = 0
+        in_idle = False
+        in_burst = False
+        for i in range(n):
+            value = values[i]
+            is_idle = value < idle_threshold
+            is_burst = value > burst_threshold
+            # The count adds the comparison itself; only run edges branch
+            idle_count += is_idle
+            if is_idle != in_idle:
+                if is_idle:
+                    idle_starts[idle_runs] = i
+                else:
+                    idle_stops[idle_runs] = i
+                    idle_runs += 1
+                in_idle = is_idle
+            if is_burst != in_burst:
+                if is_burst:
+                    burst_starts[burst_runs] = i
+                    burst_peaks[burst_runs] = value
+                else:
+                    burst_stops[burst_runs] = i
+                    burst_runs += 1
+                in_burst = is_burst
+            elif is_burst and value > burst_peaks[burst_runs]:
+                burst_peaks[burst_runs] = value
+        if in_idle:
+            idle_stops[idle_runs] = n
+            idle_runs += 1
+        if in_burst:
+            burst_stops[burst_runs] = n
+            burst_runs += 1
+        return idle_count, idle_runs, burst_runs
+    
+    @njit(
+        "Tuple((int64, int64[:], int64[:], int64[:], int64[:], float64[:]))(float64[:], float64, float64)",
+        cache=True,
+    )
+    def _scan_runs(values, idle_threshold, burst_threshold):
+        """Single-pass compiled equivalent of `_scan_runs_numpy`."""
+        bound = values.shape[0] // 2 + 1
+        idle_starts = np.empty(bound, dtype=np.int64)
+        idle_stops = np.empty(bound, dtype=np.int64)
+        burst_starts = np.empty(bound, dtype=np.int64)
+        burst_stops = np.empty(bound, dtype=np.int64)
+        burst_peaks = np.empty(bound, dtype=np.float64)
+        idle_count, idle_runs, burst_runs = _scan_into(
+            values, idle_threshold, burst_threshold,
+            idle_starts, idle_stops, burst_starts, burst_stops, burst_peaks,
+        )
+        return (
+            idle_count,
+            idle_starts[:idle_runs],
+            idle_stops[:idle_runs],
+            burst_starts[:burst_runs],
+            burst_stops[:burst_runs],
+            burst_peaks[:burst_runs],
+        )
+    
+    @njit(
+        "Tuple((int64[:], int64[:], int64[:], int64[:], int64[:], int64[:], int64[:], int64[:], float64[:]))"
+        "(float64[:], int64[:], float64, float64[:])",
+        parallel=True,
+        cache=True,
+    )
+    def _scan_runs_batch(values, offsets, idle_threshold, burst_thresholds):
+        """
+        `_scan_runs` over many series at once, one series per thread.
+        
+        Series i is values[offsets[i]:offsets[i + 1]]. Its runs land in shared
+        slabs starting at run_offsets[i], so the parallel loop never allocates.
+        """
+        count = offsets.shape[0] - 1
+        run_offsets = np.zeros(count + 1, dtype=np.int64)
+        for i in range(count):
+            run_offsets[i + 1] = run_offsets[i] + (offsets[i + 1] - offsets[i]) // 2 + 1
+        total = run_offsets[count]
+        idle_starts = np.empty(total, dtype=np.int64)
+        idle_stops = np.empty(total, dtype=np.int64)
+        burst_starts = np.empty(total, dtype=np.int64)
+        burst_stops = np.empty(total, dtype=np.int64)
+        burst_peaks = np.empty(total, dtype=np.float64)
+        idle_counts = np.empty(count, dtype=np.int64)
+        idle_runs = np.empty(count, dtype=np.int64)
+        burst_runs = np.empty(count, dtype=np.int64)
+        for i in prange(count):
+            lo, hi = run_offsets[i], run_offsets[i + 1]
+            idle_counts[i], idle_runs[i], burst_runs[i] = _scan_into(
+                values[offsets[i]:offsets[i + 1]], idle_threshold, burst_thresholds[i],
+                idle_starts[lo:hi], idle_stops[lo:hi], burst_starts[lo:hi], burst_stops[lo:hi], burst_peaks[lo:hi],
+            )
+        return (
+            idle_counts, idle_runs, burst_runs, run_offsets,
+            idle_starts, idle_stops, burst_starts, burst_stops, burst_peaks,
+        )
+else:
+    _scan_runs = _scan_runs_numpy
+
+
+def _memory_stats_numpy(values: np.ndarray):
+    """(mean, sample stddev, min, max, samples above 90%) of a non-empty series."""
+    stddev = float(values.std(ddof=1)) if len(values) > 1 else 0
+    return (
+        float(values.mean()),
+        stddev,
+        float(values.min()),
+        float(values.max()),
+        int(np.count_nonzero(values > 90)),
+    )
+
+
+if NUMBA_AVAILABLE:
+    @njit("Tuple((float64, float64, float64, float64, int64))(float64[:])", cache=True)
+    def _memory_stats(values):
+        """One-pass (Welford) compiled equivalent of `_memory_stats_numpy`."""
+        mean = 0.0
+        m2 = 0.0
+        low = values[0]
+        high = values[0]
+        pressure = 0
+        for i in range(values.shape[0]):
+            value = values[i]
+            delta = value - mean
+            mean += delta / (i + 1)
+            m2 += delta * (value - mean)
+            low = min(low, value)
+            high = max(high, value)
+            pressure += value > 90
+        n = values.shape[0]
+        stddev = np.sqrt(m2 / (n - 1)) if n > 1 else 0.0
+        return mean, stddev, low, high, pressure
+else:
+    _memory_stats = _memory_stats_numpy
+
+
+@dataclass
+class _PendingAnalysis:
+    """One workload of an `analyze_batch` call, between conversion and assembly."""
+    index: int
+    key: Optional[str]
+    instance_id: str
+    cpu_metrics: List["MetricPoint"]
+    memory_metrics: Optional[List["MetricPoint"]]
+    cpu: _MetricArrays
+    mem: Optional[_MetricArrays]
+    baseline: float
+    burst_threshold: float
+    scan: Optional[_RunScan] = None
+
+
+def _scan_many(series: List[np.ndarray], idle_threshold: float, burst_thresholds: List[float]) -> List[_RunScan]:
+    """`_scan_runs` for each series; several series are scanned in parallel."""
+    if len(series) < 2 or not NUMBA_AVAILABLE:
+        return [
+            _RunScan(*_scan_runs(values, idle_threshold, burst_threshold))
+            for values, burst_threshold in zip(series, burst_thresholds)
+        ]
+    offsets = np.zeros(len(series) + 1, dtype=np.int64)
+    np.cumsum([len(values) for values in series], out=offsets[1:])
+    (
+        idle_counts, idle_runs, burst_runs, run_offsets,
+        idle_starts, idle_stops, burst_starts, burst_stops, burst_peaks,
+    ) = _scan_runs_batch(np.concatenate(series), offsets, idle_threshold, np.array(burst_thresholds, dtype=np.float64))
+    scans = []
+    for i, lo in enumerate(run_offsets[:-1].tolist()):
+        idle_hi, burst_hi = lo + int(idle_runs[i]), lo + int(burst_runs[i])
+        scans.append(_RunScan(
+            int(idle_counts[i]),
+            idle_starts[lo:idle_hi],
+            idle_stops[lo:idle_hi],
+            burst_starts[lo:burst_hi],
+            burst_stops[lo:burst_hi],
+            burst_peaks[lo:burst_hi],
+        ))
+    return scans
+
+
+def _idle_scan(n: int) -> _RunScan:
+    """`_RunScan` of an n-point series that is idle throughout and never bursts."""
+    whole = np.array([0], dtype=np.int64), np.array([n], dtype=np.int64)
+    no_runs = np.empty(0, dtype=np.int64)
+    return _RunScan(n, *whole, no_runs, no_runs, np.empty(0, dtype=np.float64))
+
+
+def _run_bounds(arrays: _MetricArrays, starts: np.ndarray, stops: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Inclusive end index and elapsed microseconds of each run.
+    
+    A run ends at the first point that leaves it, or at the last point when the
+    series finishes inside the run.
+    """
+    ends = np.minimum(stops, len(arrays.values) - 1)
+    micros = arrays.timestamps.view(np.int64)
+    elapsed = micros[ends] - micros[starts]
+    return ends, elapsed
+
+
+def _digest(instance_id: str, *series: Optional[_MetricArrays]) -> str:
+    """Cache key covering the instance and every value and timestamp analyzed."""
+    digest = hashlib.blake2b(instance_id.encode(), digest_size=16)
+    for arrays in series:
+        if arrays is None:
+            digest.update(b"-")
+            continue
+        # Wall clock as well as the instant: the result echoes the caller's timestamps
+        digest.update(len(arrays.values).to_bytes(8, "little"))
+        for column in (arrays.values, arrays.timestamps, arrays.wall):
+            digest.update(column.tobytes())
+    return digest.hexdigest()
+
+
+def _mean(values: np.ndarray) -> float:
+    """
+    Mean with one refinement step.
+    
+    The correction term absorbs summation rounding, so a constant series
+    averages to exactly its value, as statistics.mean does.
+    """
+    mean = values.mean()
+    return float(mean + (values - mean).mean())
+
+
+def _group_means(keys: np.ndarray, values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Mean of values per distinct key, as (sorted keys, means).
+    
+    Each group is summed in sorted value order and refined as in `_mean`, so
+    groups holding the same values average to bit-identical results and ties
+    between them (peak/trough hours, days) resolve as with exact means.
+    """
+    order = np.lexsort((values, keys))
+    keys, values = keys[order], values[order]
+    starts = np.flatnonzero(np.concatenate(([True], keys[1:] != keys[:-1])))
+    counts = np.diff(np.append(starts, len(values)))
+    means = np.add.reduceat(values, starts) / counts
+    means += np.add.reduceat(values - np.repeat(means, counts), starts) / counts
+    return keys[starts], means
+
+
+def _bucket_means(keys: np.ndarray, values: np.ndarray, size: int) -> np.ndarray:
+    """Mean of values per integer key in [0, size); empty buckets are 0."""
+    out = np.zeros(size)
+    if len(keys):
+        present, means = _group_means(keys, values)
+        out[present] = means
+    return out
+
+
+def _daily_means(arrays: _MetricArrays) -> np.ndarray:
+    """Mean value per calendar day, in order of each day's first appearance."""
+    if not len(arrays.days):
+        return arrays.values[:0]
+    _, means = _group_means(arrays.days, arrays.values)
+    _, first = np.unique(arrays.days, return_index=True)
+    return means[np.argsort(first)]
+
+
+def _fit_line(y: np.ndarray) -> Tuple[float, float]:
+    """Least-squares (slope, intercept) of y against its index."""
+    x_mean = (len(y) - 1) / 2
+    y_mean = _mean(y)
+    dx = np.arange(len(y)) - x_mean
+    slope = float(dx @ (y - y_mean) / (dx @ dx))
+    return slope, y_mean - slope * x_mean
+
+
 @dataclass
 class IdlePattern:
     """Analysis of idle periods."""
@@ -135,6 +520,8 @@ class PatternDetector:
         """Initialize with optional configuration overrides."""
         self.config = config or {}
         self._apply_config()
+        self._results = OrderedDict()
+        self._results_lock = threading.Lock()
     
     def _apply_config(self):
         """Apply configuration overrides."""
@@ -148,6 +535,7 @@ class PatternDetector:
         instance_id: str,
         cpu_metrics: List[MetricPoint],
         memory_metrics: Optional[List[MetricPoint]] = None,
+        use_cache: bool = True,
     ) -> PatternAnalysis:
         """
         Perform complete pattern analysis on workload metrics.
@@ -156,20 +544,101 @@ class PatternDetector:
             instance_id: EC2 instance identifier
             cpu_metrics: CPU utilization time series
             memory_metrics: Optional memory utilization time series
+            use_cache: Reuse the analysis of identical earlier input
             
         Returns:
             Comprehensive pattern analysis
         """
+        return self.analyze_batch([(instance_id, cpu_metrics, memory_metrics)], use_cache)[0]
+    
+    def analyze_batch(
+        self,
+        instances: List[Tuple[str, List[MetricPoint], Optional[List[MetricPoint]]]],
+        use_cache: bool = True,
+    ) -> List[PatternAnalysis]:
+        """
+        Perform pattern analysis on several workloads.
+        
+        The idle/burst run scans of all series execute together, in parallel
+        when numba is available.
+        
+        Args:
+            instances: (instance_id, cpu_metrics, memory_metrics) per workload
+            use_cache: Reuse the analysis of identical earlier input
+            
+        Returns:
+            One pattern analysis per instance, in input order
+        """
+        results: List[Optional[PatternAnalysis]] = [None] * len(instances)
+        pending = []
+        for i, (instance_id, cpu_metrics, memory_metrics) in enumerate(instances):
+            # Convert once; the analyzers work on the columns
+            cpu = _to_soa(cpu_metrics)
+            mem = _to_soa(memory_metrics) if memory_metrics else None
+            
+            key = _digest(instance_id, cpu, mem) if use_cache else None
+            if key is not None:
+                with self._results_lock:
+                    cached = self._results.get(key)
+                    if cached is not None:
+                        self._results.move_to_end(key)
+                        # A private copy per hit, so callers cannot change the cached analysis
+                        results[i] = deepcopy(cached)
+                        continue
+            
+            # Burst baseline (25th percentile) and threshold for the run scan
+            baseline = self._percentile(cpu.values, 25)
+            job = _PendingAnalysis(
+                index=i,
+                key=key,
+                instance_id=instance_id,
+                cpu_metrics=cpu_metrics,
+                memory_metrics=memory_metrics,
+                cpu=cpu,
+                mem=mem,
+                baseline=baseline,
+                burst_threshold=max(baseline * self.BURST_THRESHOLD_MULTIPLIER, 20),
+            )
+            values = cpu.values
+            if len(values) and values.max() < min(self.IDLE_THRESHOLD_CPU, job.burst_threshold):
+                # Always idle: one vectorised max settles what the scan would find
+                job.scan = _idle_scan(len(values))
+            pending.append(job)
+        
+        # Idle and burst runs come from a single scan of each CPU series
+        to_scan = [job for job in pending if job.scan is None]
+        scans = _scan_many(
+            [job.cpu.values for job in to_scan],
+            float(self.IDLE_THRESHOLD_CPU),
+            [float(job.burst_threshold) for job in to_scan],
+        )
+        for job, scan in zip(to_scan, scans):
+            job.scan = scan
+        
+        for job in pending:
+            analysis = self._assemble(job)
+            if job.key is not None:
+                with self._results_lock:
+                    self._results[job.key] = deepcopy(analysis)
+                    if len(self._results) > RESULT_CACHE_SIZE:
+                        self._results.popitem(last=False)
+            results[job.index] = analysis
+        return results
+    
+    def _assemble(self, job: _PendingAnalysis) -> PatternAnalysis:
+        """Build the analysis of one workload from its columns and run scan."""
+        cpu_metrics, cpu, scan = job.cpu_metrics, job.cpu, job.scan
+        
         # Analyze each pattern type
-        idle = self._analyze_idle_pattern(cpu_metrics)
-        burst = self._analyze_burst_pattern(cpu_metrics)
-        diurnal = self._analyze_diurnal_pattern(cpu_metrics)
-        weekly = self._analyze_weekly_pattern(cpu_metrics)
-        trend = self._analyze_trend(cpu_metrics)
+        idle = self._analyze_idle_pattern(cpu_metrics, cpu, scan)
+        burst = self._analyze_burst_pattern(cpu_metrics, cpu, scan, job.baseline)
+        diurnal = self._analyze_diurnal_pattern(cpu_metrics, cpu)
+        weekly = self._analyze_weekly_pattern(cpu_metrics, cpu)
+        trend = self._analyze_trend(cpu_metrics, cpu)
         
         # Memory analysis if available
-        if memory_metrics:
-            memory = self._analyze_memory_pattern(memory_metrics)
+        if job.mem is not None:
+            memory = self._analyze_memory_pattern(job.memory_metrics, job.mem)
         else:
             memory = MemoryPattern(
                 avg_utilization=0,
@@ -191,14 +660,14 @@ class PatternDetector:
             primary_pattern, idle, burst, diurnal, weekly, memory, trend
         )
         
-        # Calculate analysis period
-        if cpu_metrics:
-            period = (cpu_metrics[-1].timestamp - cpu_metrics[0].timestamp).days
+        # Calculate analysis period (whole days, floored like timedelta.days)
+        if len(cpu.timestamps):
+            period = int((cpu.timestamps[-1] - cpu.timestamps[0]) // np.timedelta64(1, "D"))
         else:
             period = 0
         
         return PatternAnalysis(
-            instance_id=instance_id,
+            instance_id=job.instance_id,
             analysis_period_days=period,
             primary_pattern=primary_pattern,
             idle=idle,
@@ -211,7 +680,7 @@ class PatternDetector:
             recommendations=recommendations,
         )
     
-    def _analyze_idle_pattern(self, metrics: List[MetricPoint]) -> IdlePattern:
+    def _analyze_idle_pattern(self, metrics: List[MetricPoint], arrays: _MetricArrays, scan: _RunScan) -> IdlePattern:
         """Analyze idle periods in the metrics."""
         if not metrics:
             return IdlePattern(
@@ -222,33 +691,21 @@ class PatternDetector:
                 is_idle_dominant=False,
             )
         
-        # Find idle periods
-        idle_periods = []
-        in_idle = False
-        idle_start = None
-        
-        for point in metrics:
-            if point.value < self.IDLE_THRESHOLD_CPU:
-                if not in_idle:
-                    in_idle = True
-                    idle_start = point.timestamp
-            else:
-                if in_idle:
-                    idle_periods.append((idle_start, point.timestamp))
-                    in_idle = False
-        
-        # Close final idle period if still idle
-        if in_idle and idle_start:
-            idle_periods.append((idle_start, metrics[-1].timestamp))
+        # Idle periods
+        starts = scan.idle_starts
+        ends, elapsed = _run_bounds(arrays, starts, scan.idle_stops)
+        idle_periods = [
+            (metrics[s].timestamp, metrics[e].timestamp)
+            for s, e in zip(starts.tolist(), ends.tolist())
+        ]
         
         # Calculate statistics
-        idle_count = sum(1 for p in metrics if p.value < self.IDLE_THRESHOLD_CPU)
-        idle_percent = (idle_count / len(metrics)) * 100
+        idle_percent = (scan.idle_count / len(metrics)) * 100
         
         if idle_periods:
-            durations = [(end - start).total_seconds() / 3600 for start, end in idle_periods]
-            avg_duration = statistics.mean(durations)
-            max_duration = max(durations)
+            durations = elapsed / 1e6 / 3600
+            avg_duration = float(durations.mean())
+            max_duration = float(durations.max())
         else:
             avg_duration = 0
             max_duration = 0
@@ -261,7 +718,13 @@ class PatternDetector:
             is_idle_dominant=idle_percent > 70,
         )
     
-    def _analyze_burst_pattern(self, metrics: List[MetricPoint]) -> BurstPattern:
+    def _analyze_burst_pattern(
+        self,
+        metrics: List[MetricPoint],
+        arrays: _MetricArrays,
+        scan: _RunScan,
+        baseline: float,
+    ) -> BurstPattern:
         """Analyze burst patterns (spikes and quiet periods)."""
         if len(metrics) < 10:
             return BurstPattern(
@@ -273,54 +736,27 @@ class PatternDetector:
                 burst_periods=[],
             )
         
-        # Calculate baseline (25th percentile)
-        values = [p.value for p in metrics]
-        baseline = self._percentile(values, 25)
-        burst_threshold = max(baseline * self.BURST_THRESHOLD_MULTIPLIER, 20)
-        
-        # Find burst periods
-        burst_periods = []
-        in_burst = False
-        burst_start = None
-        burst_peak = 0
-        
-        for point in metrics:
-            if point.value > burst_threshold:
-                if not in_burst:
-                    in_burst = True
-                    burst_start = point.timestamp
-                    burst_peak = point.value
-                else:
-                    burst_peak = max(burst_peak, point.value)
-            else:
-                if in_burst:
-                    burst_periods.append((burst_start, point.timestamp, burst_peak))
-                    in_burst = False
-                    burst_peak = 0
-        
-        # Close final burst if still in burst
-        if in_burst and burst_start:
-            burst_periods.append((burst_start, metrics[-1].timestamp, burst_peak))
+        # Burst periods
+        starts, peaks = scan.burst_starts, scan.burst_peaks
+        ends, elapsed = _run_bounds(arrays, starts, scan.burst_stops)
         
         # Filter out very short bursts (noise)
-        min_duration = timedelta(minutes=self.MIN_BURST_DURATION_MINUTES)
+        keep = elapsed >= self.MIN_BURST_DURATION_MINUTES * 60 * 1_000_000
+        starts, ends, elapsed, peaks = starts[keep], ends[keep], elapsed[keep], peaks[keep]
         burst_periods = [
-            (s, e, p) for s, e, p in burst_periods 
-            if (e - s) >= min_duration
+            (metrics[s].timestamp, metrics[e].timestamp, p)
+            for s, e, p in zip(starts.tolist(), ends.tolist(), peaks.tolist())
         ]
         
         # Calculate statistics
         if burst_periods:
-            durations = [(e - s).total_seconds() / 60 for s, e, _ in burst_periods]
-            avg_duration = statistics.mean(durations)
-            avg_intensity = statistics.mean([p / max(baseline, 1) for _, _, p in burst_periods])
+            avg_duration = float((elapsed / 1e6 / 60).mean())
+            avg_intensity = float((peaks / max(baseline, 1)).mean())
             
             # Calculate quiet periods between bursts
-            quiet_durations = []
-            for i in range(1, len(burst_periods)):
-                quiet = (burst_periods[i][0] - burst_periods[i-1][1]).total_seconds() / 3600
-                quiet_durations.append(quiet)
-            avg_quiet = statistics.mean(quiet_durations) if quiet_durations else 0
+            micros = arrays.timestamps.view(np.int64)
+            quiet = (micros[starts[1:]] - micros[ends[:-1]]) / 1e6 / 3600
+            avg_quiet = float(quiet.mean()) if len(quiet) else 0
         else:
             avg_duration = 0
             avg_intensity = 0
@@ -342,7 +778,7 @@ class PatternDetector:
             burst_periods=burst_periods,
         )
     
-    def _analyze_diurnal_pattern(self, metrics: List[MetricPoint]) -> DiurnalPattern:
+    def _analyze_diurnal_pattern(self, metrics: List[MetricPoint], arrays: _MetricArrays) -> DiurnalPattern:
         """Analyze day/night patterns."""
         if len(metrics) < 48:  # Need at least 2 days
             return DiurnalPattern(
@@ -353,24 +789,15 @@ class PatternDetector:
                 hourly_averages={},
             )
         
-        # Group by hour of day
-        hourly_values: Dict[int, List[float]] = {h: [] for h in range(24)}
-        for point in metrics:
-            hour = point.timestamp.hour
-            hourly_values[hour].append(point.value)
-        
-        # Calculate hourly averages
-        hourly_averages = {
-            hour: statistics.mean(values) if values else 0
-            for hour, values in hourly_values.items()
-        }
+        # Average by hour of day
+        hourly = _bucket_means(arrays.hours, arrays.values, 24)
         
         # Find peak and trough
-        peak_hour = max(hourly_averages, key=hourly_averages.get)
-        trough_hour = min(hourly_averages, key=hourly_averages.get)
+        peak_hour = int(hourly.argmax())
+        trough_hour = int(hourly.argmin())
         
-        peak_value = hourly_averages[peak_hour]
-        trough_value = hourly_averages[trough_hour]
+        peak_value = float(hourly[peak_hour])
+        trough_value = float(hourly[trough_hour])
         
         ratio = peak_value / max(trough_value, 0.1)
         
@@ -379,10 +806,10 @@ class PatternDetector:
             peak_hour=peak_hour,
             trough_hour=trough_hour,
             peak_to_trough_ratio=ratio,
-            hourly_averages=hourly_averages,
+            hourly_averages=dict(enumerate(hourly.tolist())),
         )
     
-    def _analyze_weekly_pattern(self, metrics: List[MetricPoint]) -> WeeklyPattern:
+    def _analyze_weekly_pattern(self, metrics: List[MetricPoint], arrays: _MetricArrays) -> WeeklyPattern:
         """Analyze weekday/weekend patterns."""
         if len(metrics) < 168:  # Need at least 1 week
             return WeeklyPattern(
@@ -394,28 +821,16 @@ class PatternDetector:
                 daily_averages={},
             )
         
-        # Group by day of week
-        daily_values: Dict[int, List[float]] = {d: [] for d in range(7)}
-        for point in metrics:
-            day = point.timestamp.weekday()
-            daily_values[day].append(point.value)
-        
-        # Calculate daily averages
-        daily_averages = {
-            day: statistics.mean(values) if values else 0
-            for day, values in daily_values.items()
-        }
+        # Average by day of week
+        daily = _bucket_means(arrays.weekdays, arrays.values, 7)
         
         # Find peak and trough
-        peak_day = max(daily_averages, key=daily_averages.get)
-        trough_day = min(daily_averages, key=daily_averages.get)
+        peak_day = int(daily.argmax())
+        trough_day = int(daily.argmin())
         
         # Weekday vs weekend
-        weekday_values = [daily_averages[d] for d in range(5)]
-        weekend_values = [daily_averages[5], daily_averages[6]]
-        
-        weekday_avg = statistics.mean(weekday_values) if weekday_values else 0
-        weekend_avg = statistics.mean(weekend_values) if weekend_values else 0
+        weekday_avg = float(daily[:5].mean())
+        weekend_avg = float(daily[5:].mean())
         
         # Significant difference between weekday and weekend
         has_pattern = abs(weekday_avg - weekend_avg) / max(weekday_avg, weekend_avg, 1) > 0.3
@@ -426,10 +841,10 @@ class PatternDetector:
             trough_day=trough_day,
             weekday_avg=weekday_avg,
             weekend_avg=weekend_avg,
-            daily_averages=daily_averages,
+            daily_averages=dict(enumerate(daily.tolist())),
         )
     
-    def _analyze_memory_pattern(self, metrics: List[MetricPoint]) -> MemoryPattern:
+    def _analyze_memory_pattern(self, metrics: List[MetricPoint], arrays: _MetricArrays) -> MemoryPattern:
         """Analyze memory usage patterns."""
         if not metrics:
             return MemoryPattern(
@@ -442,21 +857,14 @@ class PatternDetector:
                 is_memory_stable=True,
             )
         
-        values = [p.value for p in metrics]
-        
-        avg_util = statistics.mean(values)
-        max_util = max(values)
-        min_util = min(values)
-        
-        # Count pressure events (>90% utilization)
-        pressure_events = sum(1 for v in values if v > 90)
+        # Summary statistics and pressure events (>90% utilization)
+        avg_util, stddev, min_util, max_util, pressure_events = _memory_stats(arrays.values)
         
         # Check for memory leak (sustained increase over time)
-        leak_rate = self._detect_memory_leak(metrics)
+        leak_rate = self._detect_memory_leak(metrics, arrays)
         has_leak = leak_rate is not None and leak_rate > self.MEMORY_LEAK_THRESHOLD
         
         # Stability check
-        stddev = statistics.stdev(values) if len(values) > 1 else 0
         is_stable = stddev < 10  # Less than 10% standard deviation
         
         return MemoryPattern(
@@ -469,43 +877,26 @@ class PatternDetector:
             is_memory_stable=is_stable,
         )
     
-    def _detect_memory_leak(self, metrics: List[MetricPoint]) -> Optional[float]:
+    def _detect_memory_leak(self, metrics: List[MetricPoint], arrays: _MetricArrays) -> Optional[float]:
         """Detect memory leak by looking for sustained increase."""
         if len(metrics) < 48:
             return None
         
         # Calculate daily averages
-        daily_avgs = {}
-        for point in metrics:
-            day = point.timestamp.date()
-            if day not in daily_avgs:
-                daily_avgs[day] = []
-            daily_avgs[day].append(point.value)
-        
-        daily_means = [statistics.mean(v) for v in daily_avgs.values()]
+        daily_means = _daily_means(arrays)
         
         if len(daily_means) < 3:
             return None
         
-        # Simple linear regression to find slope
-        n = len(daily_means)
-        x_mean = (n - 1) / 2
-        y_mean = statistics.mean(daily_means)
-        
-        numerator = sum((i - x_mean) * (daily_means[i] - y_mean) for i in range(n))
-        denominator = sum((i - x_mean) ** 2 for i in range(n))
-        
-        if denominator == 0:
-            return None
-        
-        slope = numerator / denominator  # % change per day
+        # Simple linear regression to find slope (% change per day)
+        slope, _ = _fit_line(daily_means)
         
         # Only report if positive (leak) and significant
         if slope > 0.5:
             return slope
         return None
     
-    def _analyze_trend(self, metrics: List[MetricPoint]) -> TrendPattern:
+    def _analyze_trend(self, metrics: List[MetricPoint], arrays: _MetricArrays) -> TrendPattern:
         """Analyze overall usage trend."""
         if len(metrics) < 48:
             return TrendPattern(
@@ -516,17 +907,10 @@ class PatternDetector:
             )
         
         # Calculate daily averages for trend
-        daily_avgs = {}
-        for point in metrics:
-            day = point.timestamp.date()
-            if day not in daily_avgs:
-                daily_avgs[day] = []
-            daily_avgs[day].append(point.value)
-        
-        daily_means = [statistics.mean(v) for v in daily_avgs.values()]
+        daily_means = _daily_means(arrays)
         
         if len(daily_means) < 3:
-            current = daily_means[-1] if daily_means else 0
+            current = float(daily_means[-1]) if len(daily_means) else 0
             return TrendPattern(
                 direction="stable",
                 slope_per_day=0,
@@ -536,26 +920,13 @@ class PatternDetector:
         
         # Linear regression
         n = len(daily_means)
-        x = list(range(n))
         y = daily_means
-        
-        x_mean = statistics.mean(x)
-        y_mean = statistics.mean(y)
-        
-        numerator = sum((x[i] - x_mean) * (y[i] - y_mean) for i in range(n))
-        denominator = sum((x[i] - x_mean) ** 2 for i in range(n))
-        
-        if denominator == 0:
-            slope = 0
-        else:
-            slope = numerator / denominator
-        
-        intercept = y_mean - slope * x_mean
+        slope, intercept = _fit_line(y)
         
         # R-squared
-        y_pred = [slope * x[i] + intercept for i in range(n)]
-        ss_res = sum((y[i] - y_pred[i]) ** 2 for i in range(n))
-        ss_tot = sum((y[i] - y_mean) ** 2 for i in range(n))
+        y_pred = slope * np.arange(n) + intercept
+        ss_res = float(((y - y_pred) ** 2).sum())
+        ss_tot = float(((y - _mean(y)) ** 2).sum())
         r_squared = 1 - (ss_res / ss_tot) if ss_tot > 0 else 0
         
         # Predict 30 days out
@@ -577,18 +948,20 @@ class PatternDetector:
             predicted_30_day_value=predicted_30,
         )
     
-    def _percentile(self, values: List[float], p: int) -> float:
-        """Calculate percentile."""
-        if not values:
+    def _percentile(self, values, p: int) -> float:
+        """Calculate percentile (linear interpolation between closest ranks)."""
+        arr = np.asarray(values, dtype=np.float64)
+        if not len(arr):
             return 0
-        sorted_values = sorted(values)
-        index = (len(sorted_values) - 1) * p / 100
+        index = (len(arr) - 1) * p / 100
         lower = int(index)
         upper = lower + 1
-        if upper >= len(sorted_values):
-            return sorted_values[-1]
+        if upper >= len(arr):
+            return float(arr.max())
+        # Selection instead of a full sort: only the two ranks are needed
+        part = np.partition(arr, [lower, upper])
         weight = index - lower
-        return sorted_values[lower] * (1 - weight) + sorted_values[upper] * weight
+        return float(part[lower]) * (1 - weight) + float(part[upper]) * weight
     
     def _determine_primary_pattern(
         self,
@@ -600,31 +973,22 @@ class PatternDetector:
     ) -> Tuple[PatternType, float]:
         """Determine the primary usage pattern and confidence."""
         
-        scores = {
-            PatternType.IDLE_DOMINANT: 0.0,
-            PatternType.BURSTY: 0.0,
-            PatternType.STEADY_STATE: 0.0,
-            PatternType.DIURNAL: 0.0,
-            PatternType.WEEKLY: 0.0,
-            PatternType.BATCH: 0.0,
-            PatternType.GROWING: 0.0,
-            PatternType.DECLINING: 0.0,
-        }
+        scores = [0.0] * len(_SCORED_PATTERNS)
         
         # Idle dominant
         if idle.is_idle_dominant:
-            scores[PatternType.IDLE_DOMINANT] = 0.8 + (idle.idle_percent - 70) / 100
+            scores[_IDLE] = 0.8 + (idle.idle_percent - 70) / 100
         
         # Bursty
         if burst.is_bursty:
-            scores[PatternType.BURSTY] = min(
+            scores[_BURSTY] = min(
                 0.5 + burst.avg_burst_intensity / 10 + burst.burst_count / 50,
                 0.95
             )
         
         # Diurnal
         if diurnal.has_diurnal_pattern:
-            scores[PatternType.DIURNAL] = min(
+            scores[_DIURNAL] = min(
                 0.5 + (diurnal.peak_to_trough_ratio - 1.5) / 3,
                 0.9
             )
@@ -632,35 +996,34 @@ class PatternDetector:
         # Weekly
         if weekly.has_weekly_pattern:
             diff_ratio = abs(weekly.weekday_avg - weekly.weekend_avg) / max(weekly.weekday_avg, 1)
-            scores[PatternType.WEEKLY] = min(0.5 + diff_ratio, 0.85)
+            scores[_WEEKLY] = min(0.5 + diff_ratio, 0.85)
         
         # Trend patterns
         if trend.direction == "growing" and trend.r_squared > 0.5:
-            scores[PatternType.GROWING] = 0.5 + trend.r_squared * 0.4
+            scores[_GROWING] = 0.5 + trend.r_squared * 0.4
         elif trend.direction == "declining" and trend.r_squared > 0.5:
-            scores[PatternType.DECLINING] = 0.5 + trend.r_squared * 0.4
+            scores[_DECLINING] = 0.5 + trend.r_squared * 0.4
         
         # Batch pattern (bursty + periodic)
         if burst.is_bursty and (diurnal.has_diurnal_pattern or weekly.has_weekly_pattern):
-            scores[PatternType.BATCH] = min(
-                scores[PatternType.BURSTY] + 0.2,
+            scores[_BATCH] = min(
+                scores[_BURSTY] + 0.2,
                 0.95
             )
         
         # Steady state (low variance, not idle)
         if not idle.is_idle_dominant and not burst.is_bursty:
             if diurnal.peak_to_trough_ratio < 1.5:
-                scores[PatternType.STEADY_STATE] = 0.7
+                scores[_STEADY] = 0.7
         
-        # Find highest score
-        best_pattern = max(scores, key=scores.get)
-        confidence = scores[best_pattern]
+        # Find highest score (first slot wins ties)
+        confidence = max(scores)
         
         # If no clear pattern, mark as erratic
         if confidence < 0.4:
             return PatternType.ERRATIC, 0.5
         
-        return best_pattern, confidence
+        return _SCORED_PATTERNS[scores.index(confidence)], confidence
     
     def _generate_recommendations(
         self,
@@ -11,12 +11,326 @@ Classifications:
 - keep_ec2: None of the above - keep on EC2
 """
 
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass, field
-from datetime import datetime, timedelta
-from typing import List, Dict, Optional, Tuple
+from datetime import datetime, timedelta, timezone
+from itertools import repeat
+from typing import List, Dict, NamedTuple, Optional, Tuple
 from enum import Enum
-import statistics
-import math
+import hashlib
+import multiprocessing
+import os
+import threading
+
+import numpy as np
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+# Classifications kept per classifier, keyed by a digest of the inputs
+RESULT_CACHE_SIZE = 1024
+
+# classify_workloads spreads fleets of at least this many instances over
+# worker processes, PARALLEL_CHUNK_SIZE instances per task
+PARALLEL_MIN_WORKLOADS = 32768
+PARALLEL_CHUNK_SIZE = 2048
+
+
+def _sorted_percentile(sorted_rows: np.ndarray, percentile: int) -> np.ndarray:
+    """
+    Percentile of each row, interpolating between closest ranks.
+    
+    Rows need only be in order at the ranks from `_percentile_ranks`.
+    """
+    n = sorted_rows.shape[-1]
+    index = (n - 1) * percentile / 100
+    lower = int(index)
+    upper = lower + 1
+    if upper >= n:
+        return sorted_rows[..., -1]
+    weight = index - lower
+    return sorted_rows[..., lower] * (1 - weight) + sorted_rows[..., upper] * weight
+
+
+def _percentile_ranks(n: int, percentile: int) -> Tuple[int, int]:
+    """Closest ranks interpolated by `_sorted_percentile` for a series of length n."""
+    lower = int((n - 1) * percentile / 100)
+    return lower, min(lower + 1, n - 1)
+
+
+def _cpu_stats_numpy(rows: np.ndarray):
+    """Per-row (mean, sample stddev, min, max, samples below 5%) of a non-empty block."""
+    n = rows.shape[1]
+    stddev = rows.std(axis=1, ddof=1) if n > 1 else np.zeros(rows.shape[0])
+    return (
+        rows.mean(axis=1),
+        stddev,
+        rows.min(axis=1),
+        rows.max(axis=1),
+        np.count_nonzero(rows < 5, axis=1),
+    )
+
+
+if NUMBA_AVAILABLE:
+    @njit(
+        "Tuple((float64[:], float64[:], float64[:], float64[:], int64[:]))(float64[:, :])",
+        cache=True,
+    )
+    def _cpu_stats(rows):
+        """
+        One-pass compiled equivalent of `_cpu_stats_numpy`.
+        
+        The variance uses Welford's update; the reported mean is the plain
+        sum over n, which stays exact for integer-valued series.
+        """
+        count, n = rows.shape
+        means = np.empty(count)
+        stddevs = np.zeros(count)
+        lows = np.empty(count)
+        highs = np.empty(count)
+        idle = np.zeros(count, dtype=np.int64)
+        for r in range(count):
+            total = 0.0
+            mean = 0.0
+            m2 = 0.0
+            low = rows[r, 0]
+            high = rows[r, 0]
+            idle_count = 0
+            for i in range(n):
+                value = rows[r, i]
+                total += value
+                delta = value - mean
+                mean += delta / (i + 1)
+                m2 += delta * (value - mean)
+                low = min(low, value)
+                high = max(high, value)
+                idle_count += value < 5
+            means[r] = total / n
+            if n > 1:
+                stddevs[r] = np.sqrt(m2 / (n - 1))
+            lows[r] = low
+            highs[r] = high
+            idle[r] = idle_count
+        return means, stddevs, lows, highs, idle
+else:
+    _cpu_stats = _cpu_stats_numpy
+
+
+def _length_groups(series: List[np.ndarray]):
+    """Yield (indices, rows) blocks of the non-empty series sharing a length."""
+    lengths = np.fromiter((len(values) for values in series), dtype=np.int64, count=len(series))
+    for n in np.unique(lengths[lengths > 0]):
+        indices = np.flatnonzero(lengths == n)
+        yield indices, np.stack([series[i] for i in indices])
+
+
+# Scoring rules as pure-numeric kernels. Each returns the raw score and a
+# bitmask of the rules that fired; bit i selects reason template i. Rules
+# are summed branch-free in template order; a rule that does not fire adds
+# an exact 0.0, so scores match the sequential if-ladder bit for bit.
+
+_LAMBDA_REASONS = (
+    "Low average CPU ({cpu_avg:.1f}%) indicates event-driven pattern",
+    "High idle time ({idle_pct:.1f}%) suggests sporadic usage",
+    "High burst ratio ({burst_ratio:.1f}x) indicates bursty workload",
+    "Low disk write activity suggests stateless processing",
+    "Persistent storage attached - may require state management",
+    "Part of Auto Scaling Group - may be steady-state service",
+    "High memory usage may exceed Lambda limits",
+)
+
+_FARGATE_REASONS = (
+    "Consistent CPU usage ({cpu_avg:.1f}%) suitable for containers",
+    "Low CPU variance (σ={cpu_stddev:.1f}) indicates predictable workload",
+    "High uptime ({uptime_pct:.1f}%) suitable for always-on container",
+    "Stable memory usage suitable for fixed container allocation",
+    "Network activity indicates service-type workload",
+    "ASG membership suggests container-friendly architecture",
+    "High disk I/O may require persistent volume strategy",
+)
+
+_SPOT_REASONS = (
+    "High variability suggests batch processing pattern",
+    "Periodic usage pattern detected - suitable for scheduled Spot",
+    "Bursty but sustained workload suitable for Spot",
+    "Compute-intensive (P95 CPU: {cpu_p95:.1f}%) benefits from Spot pricing",
+    "Low network egress suggests non-interactive workload",
+    "Long-running instance may benefit from Spot migration",
+    "Elastic IP suggests need for stable endpoint - Spot interruptions risky",
+)
+
+_KEEP_EC2_REASONS = (
+    "High, stable CPU usage ({cpu_avg:.1f}%) - well-suited for EC2",
+    "High memory usage ({memory_avg:.1f}%) - may need dedicated instance",
+    "Significant disk I/O - EC2 with EBS optimized recommended",
+    "Elastic IP indicates need for stable endpoint",
+    "Persistent storage attached - may require EC2 for data locality",
+)
+
+
+class _PendingReasons(NamedTuple):
+    """Reasons not yet formatted: the templates selected by mask, filled from values."""
+    templates: Tuple[str, ...]
+    mask: int
+    values: Dict[str, float]
+    
+    def format(self) -> List[str]:
+        return [
+            template.format(**self.values)
+            for bit, template in enumerate(self.templates)
+            if self.mask >> bit & 1
+        ]
+
+
+def _lambda_score(
+    cpu_avg, idle_pct, burst_ratio, disk_write_avg, memory_avg,
+    has_persistent_storage, in_auto_scaling_group,
+    max_avg_cpu, min_idle_percent, min_burst_ratio,
+):
+    low_cpu = cpu_avg <= max_avg_cpu
+    mostly_idle = idle_pct >= min_idle_percent
+    bursty = burst_ratio >= min_burst_ratio  # Spiky workload
+    stateless = disk_write_avg < 100  # Low disk writes suggest stateless
+    high_memory = memory_avg > 80  # Using >80% of instance memory
+    score = (
+        0.0 + 0.25 * low_cpu + 0.25 * mostly_idle + 0.2 * bursty + 0.15 * stateless
+        - 0.2 * has_persistent_storage - 0.1 * in_auto_scaling_group - 0.15 * high_memory
+    )
+    mask = (
+        low_cpu | mostly_idle << 1 | bursty << 2 | stateless << 3
+        | has_persistent_storage << 4 | in_auto_scaling_group << 5 | high_memory << 6
+    )
+    return score, mask
+
+
+def _fargate_score(
+    cpu_avg, cpu_stddev, uptime_pct, memory_stddev, net_in_avg, net_out_avg,
+    disk_write_max, in_auto_scaling_group,
+    min_avg_cpu, max_avg_cpu, max_cpu_stddev, min_uptime_percent,
+):
+    consistent = (min_avg_cpu <= cpu_avg) & (cpu_avg <= max_avg_cpu)
+    predictable = cpu_stddev <= max_cpu_stddev
+    always_on = uptime_pct >= min_uptime_percent
+    stable_memory = memory_stddev < 15
+    networked = (net_in_avg > 1000) | (net_out_avg > 1000)  # Some network activity
+    heavy_disk = disk_write_max > 1000  # Containers should be stateless
+    score = (
+        0.0 + 0.2 * consistent + 0.2 * predictable + 0.2 * always_on + 0.15 * stable_memory
+        + 0.1 * networked + 0.1 * in_auto_scaling_group - 0.15 * heavy_disk
+    )
+    mask = (
+        consistent | predictable << 1 | always_on << 2 | stable_memory << 3
+        | networked << 4 | in_auto_scaling_group << 5 | heavy_disk << 6
+    )
+    return score, mask
+
+
+def _spot_score(
+    variability, periodic, burst_ratio, cpu_avg, cpu_p95, net_out_avg,
+    instance_age_days, has_elastic_ip, lambda_max_avg_cpu,
+):
+    batch_like = variability > 1.0  # Batch processing patterns
+    sustained_bursts = (burst_ratio > 2.0) & (cpu_avg > lambda_max_avg_cpu)
+    compute_heavy = cpu_p95 > 70
+    low_egress = net_out_avg < 10000  # Low outbound traffic
+    long_running = instance_age_days > 30  # Older instances often good Spot candidates
+    score = (
+        0.0 + 0.2 * batch_like + 0.2 * periodic + 0.15 * sustained_bursts + 0.15 * compute_heavy
+        + 0.1 * low_egress + 0.1 * long_running - 0.2 * has_elastic_ip
+    )
+    mask = (
+        batch_like | periodic << 1 | sustained_bursts << 2 | compute_heavy << 3
+        | low_egress << 4 | long_running << 5 | has_elastic_ip << 6
+    )
+    return score, mask
+
+
+def _keep_ec2_score(
+    cpu_avg, cpu_stddev, memory_avg, disk_read_avg, disk_write_avg,
+    has_elastic_ip, has_persistent_storage,
+):
+    high_stable_cpu = (cpu_avg > 70) & (cpu_stddev < 15)
+    high_memory = memory_avg > 70
+    heavy_disk = (disk_read_avg > 500) | (disk_write_avg > 500)
+    score = (
+        0.3  # Base score - EC2 is always viable
+        + 0.25 * high_stable_cpu + 0.15 * high_memory + 0.15 * heavy_disk
+        + 0.1 * has_elastic_ip + 0.1 * has_persistent_storage
+    )
+    mask = (
+        high_stable_cpu | high_memory << 1 | heavy_disk << 2
+        | has_elastic_ip << 3 | has_persistent_storage << 4
+    )
+    return score, mask
+
+
+if NUMBA_AVAILABLE:
+    _lambda_score = njit(
+        "Tuple((float64, int64))(float64, float64, float64, float64, float64, "
+        "boolean, boolean, float64, float64, float64)",
+        cache=True,
+    )(_lambda_score)
+    _fargate_score = njit(
+        "Tuple((float64, int64))(float64, float64, float64, float64, float64, float64, "
+        "float64, boolean, float64, float64, float64, float64)",
+        cache=True,
+    )(_fargate_score)
+    _spot_score = njit(
+        "Tuple((float64, int64))(float64, boolean, float64, float64, float64, float64, "
+        "int64, boolean, float64)",
+        cache=True,
+    )(_spot_score)
+    _keep_ec2_score = njit(
+        "Tuple((float64, int64))(float64, float64, float64, float64, float64, boolean, boolean)",
+        cache=True,
+    )(_keep_ec2_score)
+    
+    @njit(
+        "Tuple((float64[:, :], int64[:, :]))(float64[:, :], float64[:, :], float64[:, :], float64[:, :])",
+        parallel=True,
+        cache=True,
+    )
+    def _score_all(lambda_inputs, fargate_inputs, spot_inputs, keep_ec2_inputs):
+        """All four scoring kernels over a fleet; one row of arguments per instance."""
+        n = lambda_inputs.shape[0]
+        scores = np.empty((n, 4))
+        masks = np.empty((n, 4), dtype=np.int64)
+        for i in prange(n):
+            a = lambda_inputs[i]
+            scores[i, 0], masks[i, 0] = _lambda_score(
+                a[0], a[1], a[2], a[3], a[4], a[5] != 0, a[6] != 0, a[7], a[8], a[9]
+            )
+            a = fargate_inputs[i]
+            scores[i, 1], masks[i, 1] = _fargate_score(
+                a[0], a[1], a[2], a[3], a[4], a[5], a[6], a[7] != 0, a[8], a[9], a[10], a[11]
+            )
+            a = spot_inputs[i]
+            scores[i, 2], masks[i, 2] = _spot_score(
+                a[0], a[1] != 0, a[2], a[3], a[4], a[5], np.int64(a[6]), a[7] != 0, a[8]
+            )
+            a = keep_ec2_inputs[i]
+            scores[i, 3], masks[i, 3] = _keep_ec2_score(
+                a[0], a[1], a[2], a[3], a[4], a[5] != 0, a[6] != 0
+            )
+        return scores, masks
+
+
+def _score_many(inputs: List[Tuple[tuple, tuple, tuple, tuple]]) -> Tuple[np.ndarray, np.ndarray]:
+    """Raw scores and reason masks, shape (n, 4), from per-instance kernel arguments."""
+    if len(inputs) < 2 or not NUMBA_AVAILABLE:
+        scores = np.empty((len(inputs), 4))
+        masks = np.empty((len(inputs), 4), dtype=np.int64)
+        kernels = (_lambda_score, _fargate_score, _spot_score, _keep_ec2_score)
+        for i, arguments in enumerate(inputs):
+            for k, (kernel, args) in enumerate(zip(kernels, arguments)):
+                scores[i, k], masks[i, k] = kernel(*args)
+        return scores, masks
+    
+    return _score_all(*(np.array(column, dtype=np.float64) for column in zip(*inputs)))
 
 
 class WorkloadClassification(Enum):
@@ -26,32 +340,138 @@ class WorkloadClassification(Enum):
     KEEP_EC2 = "keep_ec2"
 
 
-@dataclass
+# Column order of the score and reason-mask arrays
+_CLASS_ORDER = (
+    WorkloadClassification.LAMBDA_CANDIDATE,
+    WorkloadClassification.FARGATE_CANDIDATE,
+    WorkloadClassification.SPOT_CANDIDATE,
+    WorkloadClassification.KEEP_EC2,
+)
+
+
+@dataclass(slots=True, frozen=True)
 class MetricDataPoint:
     """Single metric data point from CloudWatch."""
     timestamp: datetime
     value: float
 
 
-@dataclass
+@dataclass(slots=True)
+class MetricSeries:
+    """One CloudWatch metric stored as parallel arrays."""
+    values: np.ndarray = field(default_factory=lambda: np.empty(0, dtype=np.float64))
+    timestamps: np.ndarray = field(default_factory=lambda: np.empty(0, dtype="datetime64[s]"))  # UTC
+    
+    def __len__(self) -> int:
+        return len(self.values)
+    
+    @classmethod
+    def from_points(cls, points: List[MetricDataPoint]) -> "MetricSeries":
+        """Stack data points into arrays."""
+        values = np.fromiter((p.value for p in points), dtype=np.float64, count=len(points))
+        return cls(values=values, timestamps=_to_datetime64([p.timestamp for p in points]))
+    
+    @classmethod
+    def from_arrays(cls, timestamps, values) -> "MetricSeries":
+        """
+        Wrap parallel timestamp and value buffers without per-point objects.
+        
+        Timestamps may be Unix seconds, datetime64 or datetimes (as returned
+        by GetMetricData); values any numeric sequence.
+        """
+        values = np.asarray(values, dtype=np.float64)
+        timestamps = np.asarray(timestamps)
+        if timestamps.dtype == object:
+            timestamps = _to_datetime64(timestamps)
+        else:
+            timestamps = timestamps.astype("datetime64[s]")
+        if timestamps.shape != values.shape:
+            raise ValueError(f"{len(timestamps)} timestamps for {len(values)} values")
+        return cls(values=values, timestamps=timestamps)
+
+
+def _to_datetime64(datetimes) -> np.ndarray:
+    """UTC datetime64[s] array from naive (taken as UTC) or aware datetimes."""
+    return np.array(
+        [t.astimezone(timezone.utc).replace(tzinfo=None) if t.tzinfo else t for t in datetimes],
+        dtype="datetime64[s]",
+    )
+
+
+# CloudWatchMetrics fields holding a MetricSeries
+_SERIES_FIELDS = (
+    "cpu_utilization", "memory_utilization", "network_in", "network_out",
+    "disk_read_ops", "disk_write_ops", "disk_read_bytes", "disk_write_bytes",
+)
+
+
+@dataclass(slots=True)
 class CloudWatchMetrics:
-    """14-day CloudWatch metrics for an EC2 instance."""
+    """
+    14-day CloudWatch metrics for an EC2 instance.
+    
+    Each metric may be given as a list of MetricDataPoint; it is stored as a
+    MetricSeries.
+    """
     instance_id: str
     instance_type: str
-    cpu_utilization: List[MetricDataPoint] = field(default_factory=list)
-    memory_utilization: List[MetricDataPoint] = field(default_factory=list)
-    network_in: List[MetricDataPoint] = field(default_factory=list)
-    network_out: List[MetricDataPoint] = field(default_factory=list)
-    disk_read_ops: List[MetricDataPoint] = field(default_factory=list)
-    disk_write_ops: List[MetricDataPoint] = field(default_factory=list)
-    disk_read_bytes: List[MetricDataPoint] = field(default_factory=list)
-    disk_write_bytes: List[MetricDataPoint] = field(default_factory=list)
+    cpu_utilization: MetricSeries = field(default_factory=MetricSeries)
+    memory_utilization: MetricSeries = field(default_factory=MetricSeries)
+    network_in: MetricSeries = field(default_factory=MetricSeries)
+    network_out: MetricSeries = field(default_factory=MetricSeries)
+    disk_read_ops: MetricSeries = field(default_factory=MetricSeries)
+    disk_write_ops: MetricSeries = field(default_factory=MetricSeries)
+    disk_read_bytes: MetricSeries = field(default_factory=MetricSeries)
+    disk_write_bytes: MetricSeries = field(default_factory=MetricSeries)
     
     # Optional metadata
     has_elastic_ip: bool = False
     has_persistent_storage: bool = False
     in_auto_scaling_group: bool = False
     instance_age_days: int = 0
+    
+    def __post_init__(self):
+        for name in _SERIES_FIELDS:
+            series = getattr(self, name)
+            if not isinstance(series, MetricSeries):
+                setattr(self, name, MetricSeries.from_points(series))
+    
+    @classmethod
+    def from_arrays(cls, instance_id: str, instance_type: str, **kwargs) -> "CloudWatchMetrics":
+        """
+        Build metrics straight from (timestamps, values) buffers.
+        
+        Each metric keyword takes a (timestamps, values) pair as accepted by
+        MetricSeries.from_arrays; other keywords set the metadata fields.
+        """
+        for name in _SERIES_FIELDS:
+            if name in kwargs:
+                kwargs[name] = MetricSeries.from_arrays(*kwargs[name])
+        return cls(instance_id=instance_id, instance_type=instance_type, **kwargs)
+
+
+class _LazyReasons:
+    """
+    Descriptor for ClassificationResult.reasons.
+    
+    Accepts a list or _PendingReasons; pending reasons are formatted on
+    first read, so callers that never look at them skip the string work.
+    """
+    
+    def __set_name__(self, owner, name):
+        self.attr = "_" + name
+    
+    def __get__(self, obj, owner=None):
+        if obj is None:
+            # No class-level value, so the dataclass field has no default
+            raise AttributeError(self.attr)
+        reasons = obj.__dict__[self.attr]
+        if isinstance(reasons, _PendingReasons):
+            reasons = obj.__dict__[self.attr] = reasons.format()
+        return reasons
+    
+    def __set__(self, obj, value):
+        obj.__dict__[self.attr] = value
 
 
 @dataclass
@@ -60,7 +480,7 @@ class ClassificationResult:
     instance_id: str
     classification: WorkloadClassification
     confidence: float  # 0.0 to 1.0
-    reasons: List[str]
+    reasons: List[str] = _LazyReasons()
     metrics_summary: Dict[str, float]
     alternative_classifications: List[Tuple[WorkloadClassification, float]]
     estimated_savings_percent: Optional[float] = None
@@ -68,6 +488,53 @@ class ClassificationResult:
     warnings: List[str] = field(default_factory=list)
 
 
+class _CachedResult(NamedTuple):
+    """
+    Immutable snapshot of a ClassificationResult kept in the result cache.
+    
+    Every cache hit builds a new result from it, so callers can modify the
+    result they get without affecting later hits.
+    """
+    instance_id: str
+    classification: WorkloadClassification
+    confidence: float
+    reasons: object  # tuple of str, or _PendingReasons not yet formatted
+    metrics_summary: Tuple[Tuple[str, float], ...]
+    alternative_classifications: Tuple[Tuple[WorkloadClassification, float], ...]
+    estimated_savings_percent: Optional[float]
+    recommended_target: Optional[str]
+    warnings: Tuple[str, ...]
+    
+    @classmethod
+    def of(cls, result: ClassificationResult) -> "_CachedResult":
+        # Read the raw slot so pending reasons stay unformatted
+        reasons = result.__dict__["_reasons"]
+        return cls(
+            result.instance_id,
+            result.classification,
+            result.confidence,
+            reasons if isinstance(reasons, _PendingReasons) else tuple(reasons),
+            tuple(result.metrics_summary.items()),
+            tuple(result.alternative_classifications),
+            result.estimated_savings_percent,
+            result.recommended_target,
+            tuple(result.warnings),
+        )
+    
+    def build(self) -> ClassificationResult:
+        return ClassificationResult(
+            instance_id=self.instance_id,
+            classification=self.classification,
+            confidence=self.confidence,
+            reasons=self.reasons if isinstance(self.reasons, _PendingReasons) else list(self.reasons),
+            metrics_summary=dict(self.metrics_summary),
+            alternative_classifications=list(self.alternative_classifications),
+            estimated_savings_percent=self.estimated_savings_percent,
+            recommended_target=self.recommended_target,
+            warnings=list(self.warnings),
+        )
+
+
 class WorkloadClassifier:
     """
     Classifies EC2 workloads for potential migration using heuristic rules.
@@ -98,6 +565,8 @@ class WorkloadClassifier:
         """Initialize classifier with optional config overrides."""
         self.config = config or {}
         self._apply_config_overrides()
+        self._results = OrderedDict()
+        self._results_lock = threading.Lock()
     
     def _apply_config_overrides(self):
         """Apply any configuration overrides to thresholds."""
@@ -107,40 +576,142 @@ class WorkloadClassifier:
             self.FARGATE_MAX_CPU_STDDEV = self.config["fargate_max_cpu_stddev"]
         # Add more overrides as needed
     
-    def classify(self, metrics: CloudWatchMetrics) -> ClassificationResult:
+    def classify(self, metrics: CloudWatchMetrics, use_cache: bool = True) -> ClassificationResult:
         """
         Classify an EC2 workload based on its CloudWatch metrics.
         
         Args:
             metrics: 14-day CloudWatch metrics for the instance
+            use_cache: Reuse the classification of identical earlier input
             
         Returns:
             ClassificationResult with classification, confidence, and reasoning
         """
+        return self.classify_batch([metrics], use_cache)[0]
+    
+    def classify_batch(
+        self, metrics_list: List[CloudWatchMetrics], use_cache: bool = True
+    ) -> List[ClassificationResult]:
+        """
+        Classify many EC2 workloads at once.
+        
+        Statistics are reduced over blocks of equal-length series and the
+        scoring rules run over the whole batch in one kernel call.
+        
+        Args:
+            metrics_list: 14-day CloudWatch metrics for each instance
+            use_cache: Reuse the classification of identical earlier input
+            
+        Returns:
+            One ClassificationResult per instance, in input order
+        """
+        results: List[Optional[ClassificationResult]] = [None] * len(metrics_list)
+        keys = [self._digest(metrics) for metrics in metrics_list] if use_cache else None
+        if keys is not None:
+            with self._results_lock:
+                for i, key in enumerate(keys):
+                    cached = self._results.get(key)
+                    if cached is not None:
+                        self._results.move_to_end(key)
+                        results[i] = cached.build()
+        
+        misses = [i for i, result in enumerate(results) if result is None]
+        if misses:
+            fresh = self._classify_uncached([metrics_list[i] for i in misses])
+            for i, result in zip(misses, fresh):
+                results[i] = result
+            if keys is not None:
+                with self._results_lock:
+                    for i, result in zip(misses, fresh):
+                        self._results[keys[i]] = _CachedResult.of(result)
+                    while len(self._results) > RESULT_CACHE_SIZE:
+                        self._results.popitem(last=False)
+        
+        return results
+    
+    def _digest(self, metrics: CloudWatchMetrics) -> str:
+        """Cache key covering the instance, every metric value and the thresholds in force."""
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(repr((
+            metrics.instance_id,
+            metrics.instance_type,
+            metrics.has_elastic_ip,
+            metrics.has_persistent_storage,
+            metrics.in_auto_scaling_group,
+            metrics.instance_age_days,
+            self.LAMBDA_MAX_AVG_CPU,
+            self.LAMBDA_MIN_IDLE_PERCENT,
+            self.LAMBDA_MIN_BURST_RATIO,
+            self.FARGATE_MIN_AVG_CPU,
+            self.FARGATE_MAX_AVG_CPU,
+            self.FARGATE_MAX_CPU_STDDEV,
+            self.FARGATE_MIN_UPTIME_PERCENT,
+        )).encode())
+        # Timestamps do not enter the classification; values only
+        for name in _SERIES_FIELDS:
+            values = getattr(metrics, name).values
+            digest.update(len(values).to_bytes(8, "little"))
+            digest.update(values.tobytes())
+        return digest.hexdigest()
+    
+    def _classify_uncached(self, metrics_list: List[CloudWatchMetrics]) -> List[ClassificationResult]:
+        """Classify a batch from scratch."""
         # Extract metric statistics
-        stats = self._compute_statistics(metrics)
+        all_stats = self._compute_statistics_batch(metrics_list)
         
         # Score each classification
-        lambda_score, lambda_reasons = self._score_lambda_candidate(metrics, stats)
-        fargate_score, fargate_reasons = self._score_fargate_candidate(metrics, stats)
-        spot_score, spot_reasons = self._score_spot_candidate(metrics, stats)
-        keep_ec2_score, keep_ec2_reasons = self._score_keep_ec2(metrics, stats)
-        
-        # Determine best classification
-        scores = [
-            (WorkloadClassification.LAMBDA_CANDIDATE, lambda_score, lambda_reasons),
-            (WorkloadClassification.FARGATE_CANDIDATE, fargate_score, fargate_reasons),
-            (WorkloadClassification.SPOT_CANDIDATE, spot_score, spot_reasons),
-            (WorkloadClassification.KEEP_EC2, keep_ec2_score, keep_ec2_reasons),
+        inputs = [
+            (
+                self._lambda_inputs(metrics, stats),
+                self._fargate_inputs(metrics, stats),
+                self._spot_inputs(metrics, stats),
+                self._keep_ec2_inputs(metrics, stats),
+            )
+            for metrics, stats in zip(metrics_list, all_stats)
         ]
+        raw_scores, masks = _score_many(inputs)
         
-        # Sort by score descending
-        scores.sort(key=lambda x: x[1], reverse=True)
+        # Clamp, then rank every instance's classifications at once; the
+        # stable sort keeps _CLASS_ORDER between equal scores
+        scores = np.concatenate(
+            (np.maximum(raw_scores[:, :3], 0), np.minimum(raw_scores[:, 3:], 1.0)), axis=1
+        )
+        order = np.argsort(-scores, axis=1, kind="stable")
+        scores, order, masks = scores.tolist(), order.tolist(), masks.tolist()
         
-        best_classification, best_score, best_reasons = scores[0]
+        return [
+            self._build_result(metrics_list[i], all_stats[i], inputs[i], scores[i], order[i], masks[i])
+            for i in range(len(metrics_list))
+        ]
+    
+    def _build_result(
+        self,
+        metrics: CloudWatchMetrics,
+        stats: Dict[str, float],
+        inputs: Tuple[tuple, tuple, tuple, tuple],
+        scores: List[float],
+        order: List[int],
+        masks: List[int],
+    ) -> ClassificationResult:
+        """Describe the best classification, given scores and their ranking."""
+        best = order[0]
+        best_classification = _CLASS_ORDER[best]
+        best_score = scores[best]
+        
+        # Only the winning classification's reasons are reported, and they
+        # are formatted when first read
+        args = inputs[best]
+        if best == 0:
+            best_reasons = _PendingReasons(_LAMBDA_REASONS, masks[0], dict(cpu_avg=args[0], idle_pct=args[1], burst_ratio=args[2]))
+        elif best == 1:
+            best_reasons = _PendingReasons(_FARGATE_REASONS, masks[1], dict(cpu_avg=args[0], cpu_stddev=args[1], uptime_pct=args[2]))
+        elif best == 2:
+            best_reasons = _PendingReasons(_SPOT_REASONS, masks[2], dict(cpu_p95=args[4]))
+        else:
+            best_reasons = _PendingReasons(_KEEP_EC2_REASONS, masks[3], dict(cpu_avg=args[0], memory_avg=args[2]))
         
         # Build alternative classifications
-        alternatives = [(s[0], s[1]) for s in scores[1:] if s[1] > 0.3]
+        alternatives = [(_CLASS_ORDER[k], scores[k]) for k in order[1:] if scores[k] > 0.3]
         
         # Generate warnings
         warnings = self._generate_warnings(metrics, stats, best_classification)
@@ -162,69 +733,68 @@ class WorkloadClassifier:
     
     def _compute_statistics(self, metrics: CloudWatchMetrics) -> Dict[str, float]:
         """Compute summary statistics from metrics."""
-        stats = {}
+        return self._compute_statistics_batch([metrics])[0]
+    
+    def _compute_statistics_batch(self, metrics_list: List[CloudWatchMetrics]) -> List[Dict[str, float]]:
+        """Compute summary statistics for many instances, one row block per series length."""
+        all_stats = [{} for _ in metrics_list]
         
         # CPU statistics
-        cpu_values = [p.value for p in metrics.cpu_utilization]
-        if cpu_values:
-            stats["cpu_avg"] = statistics.mean(cpu_values)
-            stats["cpu_max"] = max(cpu_values)
-            stats["cpu_min"] = min(cpu_values)
-            stats["cpu_stddev"] = statistics.stdev(cpu_values) if len(cpu_values) > 1 else 0
-            stats["cpu_p95"] = self._percentile(cpu_values, 95)
-            stats["cpu_p50"] = self._percentile(cpu_values, 50)
-            stats["cpu_idle_percent"] = len([v for v in cpu_values if v < 5]) / len(cpu_values) * 100
+        for indices, cpu in _length_groups([m.cpu_utilization.values for m in metrics_list]):
+            n = cpu.shape[1]
+            avg, stddev, low, high, idle = _cpu_stats(cpu)
+            # Only the ranks either side of each percentile need to be in place
+            ranks = sorted({*_percentile_ranks(n, 95), *_percentile_ranks(n, 50)})
+            cpu_ranked = np.partition(cpu, ranks, axis=1)
+            p95 = _sorted_percentile(cpu_ranked, 95)
+            p50 = _sorted_percentile(cpu_ranked, 50)
+            for row, i in enumerate(indices):
+                stats = all_stats[i]
+                stats["cpu_avg"] = float(avg[row])
+                stats["cpu_max"] = float(high[row])
+                stats["cpu_min"] = float(low[row])
+                stats["cpu_stddev"] = float(stddev[row]) if n > 1 else 0
+                stats["cpu_p95"] = float(p95[row])
+                stats["cpu_p50"] = float(p50[row])
+                stats["cpu_idle_percent"] = int(idle[row]) / n * 100
         
         # Memory statistics
-        mem_values = [p.value for p in metrics.memory_utilization]
-        if mem_values:
-            stats["memory_avg"] = statistics.mean(mem_values)
-            stats["memory_max"] = max(mem_values)
-            stats["memory_stddev"] = statistics.stdev(mem_values) if len(mem_values) > 1 else 0
-        
-        # Network statistics
-        net_in = [p.value for p in metrics.network_in]
-        net_out = [p.value for p in metrics.network_out]
-        if net_in:
-            stats["network_in_avg"] = statistics.mean(net_in)
-            stats["network_in_max"] = max(net_in)
-        if net_out:
-            stats["network_out_avg"] = statistics.mean(net_out)
-            stats["network_out_max"] = max(net_out)
-        
-        # Disk I/O statistics
-        disk_read = [p.value for p in metrics.disk_read_ops]
-        disk_write = [p.value for p in metrics.disk_write_ops]
-        if disk_read:
-            stats["disk_read_ops_avg"] = statistics.mean(disk_read)
-        if disk_write:
-            stats["disk_write_ops_avg"] = statistics.mean(disk_write)
-            stats["disk_write_ops_max"] = max(disk_write)
+        for indices, mem in _length_groups([m.memory_utilization.values for m in metrics_list]):
+            n = mem.shape[1]
+            avg = mem.mean(axis=1)
+            peak = mem.max(axis=1)
+            stddev = mem.std(axis=1, ddof=1) if n > 1 else None
+            for row, i in enumerate(indices):
+                stats = all_stats[i]
+                stats["memory_avg"] = float(avg[row])
+                stats["memory_max"] = float(peak[row])
+                stats["memory_stddev"] = float(stddev[row]) if n > 1 else 0
+        
+        # Network and disk I/O statistics
+        for name, keys in (
+            ("network_in", ("network_in_avg", "network_in_max")),
+            ("network_out", ("network_out_avg", "network_out_max")),
+            ("disk_read_ops", ("disk_read_ops_avg",)),
+            ("disk_write_ops", ("disk_write_ops_avg", "disk_write_ops_max")),
+        ):
+            for indices, block in _length_groups([getattr(m, name).values for m in metrics_list]):
+                avg = block.mean(axis=1)
+                peak = block.max(axis=1) if len(keys) > 1 else None
+                for row, i in enumerate(indices):
+                    all_stats[i][keys[0]] = float(avg[row])
+                    if peak is not None:
+                        all_stats[i][keys[1]] = float(peak[row])
         
         # Derived metrics
-        stats["burst_ratio"] = stats.get("cpu_max", 0) / max(stats.get("cpu_avg", 1), 0.1)
-        stats["variability_score"] = stats.get("cpu_stddev", 0) / max(stats.get("cpu_avg", 1), 0.1)
-        
-        return stats
-    
-    def _percentile(self, values: List[float], percentile: int) -> float:
-        """Calculate percentile of a list of values."""
-        if not values:
-            return 0.0
-        sorted_values = sorted(values)
-        index = (len(sorted_values) - 1) * percentile / 100
-        lower = int(index)
-        upper = lower + 1
-        if upper >= len(sorted_values):
-            return sorted_values[-1]
-        weight = index - lower
-        return sorted_values[lower] * (1 - weight) + sorted_values[upper] * weight
-    
-    def _score_lambda_candidate(
-        self, metrics: CloudWatchMetrics, stats: Dict[str, float]
-    ) -> Tuple[float, List[str]]:
+        for stats in all_stats:
+            stats["burst_ratio"] = stats.get("cpu_max", 0) / max(stats.get("cpu_avg", 1), 0.1)
+            stats["variability_score"] = stats.get("cpu_stddev", 0) / max(stats.get("cpu_avg", 1), 0.1)
+        
+        return all_stats
+    
+    def _lambda_inputs(self, metrics: CloudWatchMetrics, stats: Dict[str, float]) -> tuple:
         """
-        Score workload as Lambda candidate.
+        Arguments for the Lambda candidate score.
         
         Lambda is ideal for:
         - Bursty, event-driven workloads
@@ -232,56 +802,22 @@ class WorkloadClassifier:
         - Stateless processing
         - High idle time with occasional spikes
         """
-        score = 0.0
-        reasons = []
-        
-        # Check average CPU (should be low)
-        cpu_avg = stats.get("cpu_avg", 100)
-        if cpu_avg <= self.LAMBDA_MAX_AVG_CPU:
-            score += 0.25
-            reasons.append(f"Low average CPU ({cpu_avg:.1f}%) indicates event-driven pattern")
-        
-        # Check idle percentage (should be high)
-        idle_pct = stats.get("cpu_idle_percent", 0)
-        if idle_pct >= self.LAMBDA_MIN_IDLE_PERCENT:
-            score += 0.25
-            reasons.append(f"High idle time ({idle_pct:.1f}%) suggests sporadic usage")
-        
-        # Check burst ratio (should be high - indicating spiky workload)
-        burst_ratio = stats.get("burst_ratio", 0)
-        if burst_ratio >= self.LAMBDA_MIN_BURST_RATIO:
-            score += 0.2
-            reasons.append(f"High burst ratio ({burst_ratio:.1f}x) indicates bursty workload")
-        
-        # Check for stateless indicators (low disk writes)
-        disk_write_avg = stats.get("disk_write_ops_avg", 0)
-        if disk_write_avg < 100:  # Low disk writes suggest stateless
-            score += 0.15
-            reasons.append("Low disk write activity suggests stateless processing")
-        
-        # Penalize if persistent storage attached
-        if metrics.has_persistent_storage:
-            score -= 0.2
-            reasons.append("Persistent storage attached - may require state management")
-        
-        # Penalize if in ASG (usually indicates steady-state service)
-        if metrics.in_auto_scaling_group:
-            score -= 0.1
-            reasons.append("Part of Auto Scaling Group - may be steady-state service")
-        
-        # Memory check for Lambda limits
-        memory_avg = stats.get("memory_avg", 0)
-        if memory_avg > 80:  # Using >80% of instance memory
-            score -= 0.15
-            reasons.append("High memory usage may exceed Lambda limits")
-        
-        return max(score, 0), reasons
-    
-    def _score_fargate_candidate(
-        self, metrics: CloudWatchMetrics, stats: Dict[str, float]
-    ) -> Tuple[float, List[str]]:
+        return (
+            stats.get("cpu_avg", 100),
+            stats.get("cpu_idle_percent", 0),
+            stats.get("burst_ratio", 0),
+            stats.get("disk_write_ops_avg", 0),
+            stats.get("memory_avg", 0),
+            metrics.has_persistent_storage,
+            metrics.in_auto_scaling_group,
+            self.LAMBDA_MAX_AVG_CPU,
+            self.LAMBDA_MIN_IDLE_PERCENT,
+            self.LAMBDA_MIN_BURST_RATIO,
+        )
+    
+    def _fargate_inputs(self, metrics: CloudWatchMetrics, stats: Dict[str, float]) -> tuple:
         """
-        Score workload as Fargate candidate.
+        Arguments for the Fargate candidate score.
         
         Fargate is ideal for:
         - Containerizable workloads
@@ -289,59 +825,24 @@ class WorkloadClassifier:
         - Consistent resource requirements
         - Long-running services
         """
-        score = 0.0
-        reasons = []
-        
-        # Check for consistent usage (moderate CPU, low variance)
-        cpu_avg = stats.get("cpu_avg", 0)
-        cpu_stddev = stats.get("cpu_stddev", 100)
-        
-        if self.FARGATE_MIN_AVG_CPU <= cpu_avg <= self.FARGATE_MAX_AVG_CPU:
-            score += 0.2
-            reasons.append(f"Consistent CPU usage ({cpu_avg:.1f}%) suitable for containers")
-        
-        if cpu_stddev <= self.FARGATE_MAX_CPU_STDDEV:
-            score += 0.2
-            reasons.append(f"Low CPU variance (σ={cpu_stddev:.1f}) indicates predictable workload")
-        
-        # Check uptime pattern (should be high for Fargate)
-        idle_pct = stats.get("cpu_idle_percent", 100)
-        uptime_pct = 100 - idle_pct
-        if uptime_pct >= self.FARGATE_MIN_UPTIME_PERCENT:
-            score += 0.2
-            reasons.append(f"High uptime ({uptime_pct:.1f}%) suitable for always-on container")
-        
-        # Check memory stability
-        memory_stddev = stats.get("memory_stddev", 100)
-        if memory_stddev < 15:
-            score += 0.15
-            reasons.append("Stable memory usage suitable for fixed container allocation")
-        
-        # Network activity suggests service workload
-        net_in_avg = stats.get("network_in_avg", 0)
-        net_out_avg = stats.get("network_out_avg", 0)
-        if net_in_avg > 1000 or net_out_avg > 1000:  # Some network activity
-            score += 0.1
-            reasons.append("Network activity indicates service-type workload")
-        
-        # Bonus for ASG membership (containerization natural fit)
-        if metrics.in_auto_scaling_group:
-            score += 0.1
-            reasons.append("ASG membership suggests container-friendly architecture")
-        
-        # Penalize high disk I/O (containers should be stateless)
-        disk_write_max = stats.get("disk_write_ops_max", 0)
-        if disk_write_max > 1000:
-            score -= 0.15
-            reasons.append("High disk I/O may require persistent volume strategy")
-        
-        return max(score, 0), reasons
-    
-    def _score_spot_candidate(
-        self, metrics: CloudWatchMetrics, stats: Dict[str, float]
-    ) -> Tuple[float, List[str]]:
+        return (
+            stats.get("cpu_avg", 0),
+            stats.get("cpu_stddev", 100),
+            100 - stats.get("cpu_idle_percent", 100),
+            stats.get("memory_stddev", 100),
+            stats.get("network_in_avg", 0),
+            stats.get("network_out_avg", 0),
+            stats.get("disk_write_ops_max", 0),
+            metrics.in_auto_scaling_group,
+            self.FARGATE_MIN_AVG_CPU,
+            self.FARGATE_MAX_AVG_CPU,
+            self.FARGATE_MAX_CPU_STDDEV,
+            self.FARGATE_MIN_UPTIME_PERCENT,
+        )
+    
+    def _spot_inputs(self, metrics: CloudWatchMetrics, stats: Dict[str, float]) -> tuple:
         """
-        Score workload as Spot Instance candidate.
+        Arguments for the Spot Instance candidate score.
         
         Spot is ideal for:
         - Fault-tolerant workloads
@@ -349,57 +850,21 @@ class WorkloadClassifier:
         - Flexible timing requirements
         - Workloads that can checkpoint
         """
-        score = 0.0
-        reasons = []
-        
-        # Check for batch processing patterns (periodic high usage)
-        variability = stats.get("variability_score", 0)
-        if variability > 1.0:
-            score += 0.2
-            reasons.append("High variability suggests batch processing pattern")
-        
-        # Check if workload shows periodic patterns
-        cpu_values = [p.value for p in metrics.cpu_utilization]
-        if self._detect_periodic_pattern(cpu_values):
-            score += 0.2
-            reasons.append("Periodic usage pattern detected - suitable for scheduled Spot")
-        
-        # High burst ratio but longer duration than Lambda
-        burst_ratio = stats.get("burst_ratio", 0)
-        cpu_avg = stats.get("cpu_avg", 0)
-        if burst_ratio > 2.0 and cpu_avg > self.LAMBDA_MAX_AVG_CPU:
-            score += 0.15
-            reasons.append("Bursty but sustained workload suitable for Spot")
-        
-        # Check for compute-heavy workload (good Spot candidate)
-        cpu_p95 = stats.get("cpu_p95", 0)
-        if cpu_p95 > 70:
-            score += 0.15
-            reasons.append(f"Compute-intensive (P95 CPU: {cpu_p95:.1f}%) benefits from Spot pricing")
-        
-        # Low network I/O suggests batch (not real-time service)
-        net_out_avg = stats.get("network_out_avg", 0)
-        if net_out_avg < 10000:  # Low outbound traffic
-            score += 0.1
-            reasons.append("Low network egress suggests non-interactive workload")
-        
-        # Instance age - older instances often good Spot candidates
-        if metrics.instance_age_days > 30:
-            score += 0.1
-            reasons.append("Long-running instance may benefit from Spot migration")
-        
-        # Penalize if Elastic IP (suggests need for stable endpoint)
-        if metrics.has_elastic_ip:
-            score -= 0.2
-            reasons.append("Elastic IP suggests need for stable endpoint - Spot interruptions risky")
-        
-        return max(score, 0), reasons
-    
-    def _score_keep_ec2(
-        self, metrics: CloudWatchMetrics, stats: Dict[str, float]
-    ) -> Tuple[float, List[str]]:
+        return (
+            stats.get("variability_score", 0),
+            self._detect_periodic_pattern(metrics.cpu_utilization.values),
+            stats.get("burst_ratio", 0),
+            stats.get("cpu_avg", 0),
+            stats.get("cpu_p95", 0),
+            stats.get("network_out_avg", 0),
+            metrics.instance_age_days,
+            metrics.has_elastic_ip,
+            self.LAMBDA_MAX_AVG_CPU,
+        )
+    
+    def _keep_ec2_inputs(self, metrics: CloudWatchMetrics, stats: Dict[str, float]) -> tuple:
         """
-        Score workload for keeping on EC2.
+        Arguments for the keep-on-EC2 score.
         
         Keep on EC2 when:
         - High, consistent utilization
@@ -407,48 +872,23 @@ class WorkloadClassifier:
         - Performance-critical workloads
         - Complex networking requirements
         """
-        score = 0.3  # Base score - EC2 is always viable
-        reasons = []
-        
-        # High consistent CPU usage
-        cpu_avg = stats.get("cpu_avg", 0)
-        cpu_stddev = stats.get("cpu_stddev", 0)
-        
-        if cpu_avg > 70 and cpu_stddev < 15:
-            score += 0.25
-            reasons.append(f"High, stable CPU usage ({cpu_avg:.1f}%) - well-suited for EC2")
-        
-        # High memory utilization
-        memory_avg = stats.get("memory_avg", 0)
-        if memory_avg > 70:
-            score += 0.15
-            reasons.append(f"High memory usage ({memory_avg:.1f}%) - may need dedicated instance")
-        
-        # Heavy disk I/O
-        disk_read_avg = stats.get("disk_read_ops_avg", 0)
-        disk_write_avg = stats.get("disk_write_ops_avg", 0)
-        if disk_read_avg > 500 or disk_write_avg > 500:
-            score += 0.15
-            reasons.append("Significant disk I/O - EC2 with EBS optimized recommended")
-        
-        # Elastic IP suggests stable endpoint requirement
-        if metrics.has_elastic_ip:
-            score += 0.1
-            reasons.append("Elastic IP indicates need for stable endpoint")
-        
-        # Persistent storage
-        if metrics.has_persistent_storage:
-            score += 0.1
-            reasons.append("Persistent storage attached - may require EC2 for data locality")
-        
-        return min(score, 1.0), reasons
-    
-    def _detect_periodic_pattern(self, values: List[float], min_periods: int = 2) -> bool:
+        return (
+            stats.get("cpu_avg", 0),
+            stats.get("cpu_stddev", 0),
+            stats.get("memory_avg", 0),
+            stats.get("disk_read_ops_avg", 0),
+            stats.get("disk_write_ops_avg", 0),
+            metrics.has_elastic_ip,
+            metrics.has_persistent_storage,
+        )
+    
+    def _detect_periodic_pattern(self, values: np.ndarray, min_periods: int = 2) -> bool:
         """
         Simple periodic pattern detection using autocorrelation.
         
         Returns True if periodic pattern detected.
         """
+        values = np.asarray(values, dtype=np.float64)
         if len(values) < 48:  # Need at least 2 days of hourly data
             return False
         
@@ -458,45 +898,26 @@ class WorkloadClassifier:
             if len(values) < period * min_periods:
                 continue
             
-            # Compare first period with subsequent periods
-            correlations = []
-            for i in range(1, min_periods):
-                start = i * period
-                end = start + period
-                if end > len(values):
-                    break
-                
-                # Simple correlation check
-                first_period = values[:period]
-                this_period = values[start:end]
-                
-                if len(first_period) == len(this_period):
-                    corr = self._simple_correlation(first_period, this_period)
-                    correlations.append(corr)
+            # Pearson correlation of the first period with each subsequent
+            # one, all rows at once. Subtracting each row's first value
+            # keeps flat rows at exactly zero variance.
+            periods = values[:period * min_periods].reshape(min_periods, period)
+            periods = periods - periods[:, :1]
+            centered = periods - periods.mean(axis=1, keepdims=True)
+            norms = np.sqrt(np.einsum("ij,ij->i", centered, centered))
+            numerators = centered[1:] @ centered[0]
+            denominators = norms[1:] * norms[0]
+            correlations = np.divide(
+                numerators, denominators,
+                out=np.zeros_like(numerators),
+                where=(norms[1:] != 0) & (norms[0] != 0),
+            )
             
-            if correlations and statistics.mean(correlations) > 0.7:
+            if correlations.size and correlations.mean() > 0.7:
                 return True
         
         return False
     
-    def _simple_correlation(self, x: List[float], y: List[float]) -> float:
-        """Calculate simple Pearson correlation coefficient."""
-        if len(x) != len(y) or len(x) == 0:
-            return 0.0
-        
-        n = len(x)
-        mean_x = sum(x) / n
-        mean_y = sum(y) / n
-        
-        numerator = sum((x[i] - mean_x) * (y[i] - mean_y) for i in range(n))
-        denom_x = math.sqrt(sum((xi - mean_x) ** 2 for xi in x))
-        denom_y = math.sqrt(sum((yi - mean_y) ** 2 for yi in y))
-        
-        if denom_x == 0 or denom_y == 0:
-            return 0.0
-        
-        return numerator / (denom_x * denom_y)
-    
     def _generate_warnings(
         self,
         metrics: CloudWatchMetrics,
@@ -594,23 +1015,45 @@ class WorkloadClassifier:
                 return None, None
 
 
+def _classify_chunk(config: Optional[Dict], workloads: List[CloudWatchMetrics]) -> List[ClassificationResult]:
+    """Worker-process entry point for classify_workloads."""
+    return WorkloadClassifier(config).classify_batch(workloads, use_cache=False)
+
+
 # Batch classification helper
 def classify_workloads(
     workloads: List[CloudWatchMetrics],
-    config: Optional[Dict] = None
+    config: Optional[Dict] = None,
+    max_workers: Optional[int] = None,
 ) -> List[ClassificationResult]:
     """
     Classify multiple workloads.
     
+    Fleets of PARALLEL_MIN_WORKLOADS or more are split into chunks and
+    classified in a process pool; smaller ones run in this process, where
+    the pool's start-up would cost more than it saves.
+    
     Args:
         workloads: List of CloudWatch metrics for each instance
         config: Optional configuration overrides
+        max_workers: Worker processes for large fleets (default: CPU count);
+            1 keeps everything in this process
         
     Returns:
         List of classification results
     """
-    classifier = WorkloadClassifier(config)
-    return [classifier.classify(w) for w in workloads]
+    max_workers = max_workers or os.cpu_count() or 1
+    if max_workers == 1 or len(workloads) < PARALLEL_MIN_WORKLOADS:
+        return WorkloadClassifier(config).classify_batch(workloads)
+    
+    chunks = [
+        workloads[start:start + PARALLEL_CHUNK_SIZE]
+        for start in range(0, len(workloads), PARALLEL_CHUNK_SIZE)
+    ]
+    # Spawned, not forked: numba's thread pool may already be running here
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=max_workers, mp_context=context) as pool:
+        return [result for chunk in pool.map(_classify_chunk, repeat(config), chunks) for result in chunk]
 
 
 # Example usage and testing
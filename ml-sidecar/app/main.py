@@ -26,7 +26,6 @@ from classifier import (
     WorkloadClassifier,
     WorkloadClassification,
     CloudWatchMetrics,
-    MetricDataPoint,
     PatternDetector,
     PatternType,
     MetricPoint,
@@ -47,6 +46,10 @@ from architecture import (
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Shared so repeated polls for the same instance hit their result caches
+workload_classifier = WorkloadClassifier()
+pattern_detector = PatternDetector()
+
 # Initialize FastAPI app
 app = FastAPI(
     title="FinOpsMind ML Sidecar",
@@ -300,6 +303,12 @@ async def health():
     }
 
 
+def _metric_arrays(points: Optional[List[MetricPointRequest]]):
+    """(timestamps, values) columns of a request metric, for CloudWatchMetrics.from_arrays."""
+    points = points or []
+    return [p.timestamp for p in points], [p.value for p in points]
+
+
 @app.post("/classify/workload", response_model=WorkloadClassifyResponse)
 async def classify_workload(request: WorkloadClassifyRequest):
     """
@@ -313,33 +322,15 @@ async def classify_workload(request: WorkloadClassifyRequest):
     """
     try:
         # Convert request to CloudWatchMetrics
-        metrics = CloudWatchMetrics(
+        metrics = CloudWatchMetrics.from_arrays(
             instance_id=request.instance_id,
             instance_type=request.instance_type,
-            cpu_utilization=[
-                MetricDataPoint(timestamp=p.timestamp, value=p.value)
-                for p in request.cpu_utilization
-            ],
-            memory_utilization=[
-                MetricDataPoint(timestamp=p.timestamp, value=p.value)
-                for p in (request.memory_utilization or [])
-            ],
-            network_in=[
-                MetricDataPoint(timestamp=p.timestamp, value=p.value)
-                for p in (request.network_in or [])
-            ],
-            network_out=[
-                MetricDataPoint(timestamp=p.timestamp, value=p.value)
-                for p in (request.network_out or [])
-            ],
-            disk_read_ops=[
-                MetricDataPoint(timestamp=p.timestamp, value=p.value)
-                for p in (request.disk_read_ops or [])
-            ],
-            disk_write_ops=[
-                MetricDataPoint(timestamp=p.timestamp, value=p.value)
-                for p in (request.disk_write_ops or [])
-            ],
+            cpu_utilization=_metric_arrays(request.cpu_utilization),
+            memory_utilization=_metric_arrays(request.memory_utilization),
+            network_in=_metric_arrays(request.network_in),
+            network_out=_metric_arrays(request.network_out),
+            disk_read_ops=_metric_arrays(request.disk_read_ops),
+            disk_write_ops=_metric_arrays(request.disk_write_ops),
             has_elastic_ip=request.has_elastic_ip,
             has_persistent_storage=request.has_persistent_storage,
             in_auto_scaling_group=request.in_auto_scaling_group,
@@ -347,14 +338,12 @@ async def classify_workload(request: WorkloadClassifyRequest):
         )
         
         # Classify workload
-        classifier = WorkloadClassifier()
-        result = classifier.classify(metrics)
+        result = workload_classifier.classify(metrics)
         
         # Pattern analysis
         pattern_analysis = None
         if request.cpu_utilization:
-            detector = PatternDetector()
-            pattern_result = detector.analyze(
+            pattern_result = pattern_detector.analyze(
                 request.instance_id,
                 [MetricPoint(timestamp=p.timestamp, value=p.value) for p in request.cpu_utilization],
                 [MetricPoint(timestamp=p.timestamp, value=p.value) for p in (request.memory_utilization or [])],
@@ -150,6 +150,75 @@ class TestWorkloadClassifier:
         
         # Should have alternative classifications
         assert isinstance(result.alternative_classifications, list)
+    
+    def test_classify_batch_matches_classify(self):
+        """Batch classification should agree with classifying each instance alone."""
+        fleet = [
+            CloudWatchMetrics(
+                instance_id=f"i-batch-{pattern}-{hours}",
+                instance_type="t3.medium",
+                cpu_utilization=generate_metric_data(hours, pattern),
+                has_elastic_ip=pattern == "steady",
+            )
+            for pattern in ("bursty", "steady", "diurnal")
+            for hours in (168, 336)
+        ]
+        
+        classifier = WorkloadClassifier()
+        results = classifier.classify_batch(fleet)
+        
+        assert [r.instance_id for r in results] == [m.instance_id for m in fleet]
+        for result, metrics in zip(results, fleet):
+            single = classifier.classify(metrics, use_cache=False)
+            assert result.classification == single.classification
+            assert result.confidence == single.confidence
+            assert result.reasons == single.reasons
+            assert result.metrics_summary == single.metrics_summary
+    
+    def test_from_arrays_matches_points(self):
+        """Metrics built from raw buffers should classify like point lists."""
+        cpu = generate_metric_data(336, "steady")
+        from_points = CloudWatchMetrics(instance_id="i-arrays", instance_type="m5.large", cpu_utilization=cpu)
+        from_arrays = CloudWatchMetrics.from_arrays(
+            "i-arrays",
+            "m5.large",
+            cpu_utilization=([p.timestamp for p in cpu], [p.value for p in cpu]),
+        )
+        
+        assert (from_arrays.cpu_utilization.values == from_points.cpu_utilization.values).all()
+        assert (from_arrays.cpu_utilization.timestamps == from_points.cpu_utilization.timestamps).all()
+        
+        classifier = WorkloadClassifier()
+        assert classifier.classify(from_arrays) == classifier.classify(from_points)
+    
+    def test_classification_cache(self):
+        """Identical input should reuse the cached classification."""
+        cpu = generate_metric_data(168, "bursty")
+        metrics = CloudWatchMetrics(instance_id="i-cache", instance_type="t3.medium", cpu_utilization=cpu)
+        
+        classifier = WorkloadClassifier()
+        first = classifier.classify(metrics)
+        
+        same = CloudWatchMetrics(instance_id="i-cache", instance_type="t3.medium", cpu_utilization=list(cpu))
+        assert classifier.classify(same) == first
+        
+        # Each hit is a fresh result, so changes to one do not leak into the next
+        first.reasons.append("edited")
+        first.warnings.clear()
+        first.metrics_summary["cpu_avg"] = -1.0
+        again = classifier.classify(same)
+        assert again is not first
+        assert "edited" not in again.reasons
+        assert again.metrics_summary["cpu_avg"] != -1.0
+        assert again == classifier.classify(metrics, use_cache=False)
+        
+        with_eip = CloudWatchMetrics(
+            instance_id="i-cache", instance_type="t3.medium", cpu_utilization=cpu, has_elastic_ip=True
+        )
+        assert classifier.classify(with_eip) != again
+        
+        classifier.LAMBDA_MAX_AVG_CPU = 5.0
+        assert classifier.classify(metrics) != again
 
 
 # ============================================================================
@@ -213,6 +282,58 @@ class TestPatternDetector:
         result = detector.analyze("i-burst", data)
         
         assert result.burst.burst_count > 0
+    
+    def test_analysis_cache_isolates_callers(self):
+        """Changes to a returned analysis should not leak into later cache hits."""
+        base_time = datetime.now() - timedelta(hours=72)
+        data = [
+            MetricPoint(timestamp=base_time + timedelta(hours=h), value=random.uniform(2, 90))
+            for h in range(72)
+        ]
+        
+        detector = PatternDetector()
+        first = detector.analyze("i-cache", data)
+        expected = detector.analyze("i-cache", data, use_cache=False)
+        
+        first.recommendations.append("edited")
+        first.diurnal.hourly_averages[0] = 999
+        again = detector.analyze("i-cache", data)
+        
+        assert again is not first
+        assert again == expected
+        assert "edited" not in again.recommendations
+    
+    def test_analysis_cache(self):
+        """Identical input should reuse the cached analysis."""
+        base_time = datetime.now() - timedelta(hours=72)
+        data = [
+            MetricPoint(timestamp=base_time + timedelta(hours=h), value=random.uniform(2, 90))
+            for h in range(72)
+        ]
+        
+        detector = PatternDetector()
+        first = detector.analyze("i-cache", data)
+        
+        assert detector.analyze("i-cache", list(data)) == first
+        assert detector.analyze("i-other", data) != first
+        assert detector.analyze("i-cache", data[1:]) != first
+        assert detector.analyze("i-cache", data, use_cache=False) == first
+    
+    def test_analyze_batch_matches_analyze(self):
+        """Batch analysis should agree with analyzing each instance alone."""
+        instances = [
+            (f"i-batch-{pattern}", generate_metric_data(200, pattern), None)
+            for pattern in ("bursty", "steady", "diurnal", "random")
+        ]
+        
+        results = PatternDetector().analyze_batch(instances)
+        
+        assert [r.instance_id for r in results] == [i[0] for i in instances]
+        for result, (instance_id, cpu, _) in zip(results, instances):
+            single = PatternDetector().analyze(instance_id, cpu)
+            assert result.primary_pattern == single.primary_pattern
+            assert result.idle == single.idle
+            assert result.burst == single.burst
 
 
 # ============================================================================
@@ -387,6 +508,46 @@ class TestArchitectureAnalyzer:
         ]
         assert len(aurora_candidates) > 0
     
+    def test_rds_candidate_scoring(self):
+        """Should score each RDS instance independently in a batch."""
+        resources = [
+            ResourceMetrics(
+                resource_id="rds-idle",
+                resource_type=ResourceType.RDS,
+                avg_cpu_percent=10,
+                avg_memory_percent=30,
+                avg_connections=20,
+                max_connections=40,
+                monthly_cost=400,
+                engine="MySQL",
+            ),
+            ResourceMetrics(
+                resource_id="rds-busy",
+                resource_type=ResourceType.RDS,
+                avg_cpu_percent=80,
+                avg_connections=20,
+                max_connections=40,
+                engine="postgresql",
+            ),
+            ResourceMetrics(
+                resource_id="rds-oracle",
+                resource_type=ResourceType.RDS,
+                avg_cpu_percent=10,
+                engine="oracle-ee",
+            ),
+        ]
+        
+        analyzer = ArchitectureAnalyzer()
+        result = analyzer.analyze(resources)
+        
+        # Only the idle MySQL instance qualifies
+        assert [c.resource_id for c in result.migration_candidates] == ["rds-idle"]
+        candidate = result.migration_candidates[0]
+        assert candidate.confidence == pytest.approx(2 / 3)
+        assert candidate.estimated_savings_percent == pytest.approx(40)
+        assert candidate.estimated_savings_monthly == pytest.approx(160)
+        assert isinstance(candidate.estimated_savings_monthly, float)
+    
     def test_monolith_detection(self):
         """Should detect monolithic architecture."""
         resources = [
@@ -458,6 +619,79 @@ class TestArchitectureAnalyzer:
         
         # Modern should have higher score
         assert modern_result.modernization_score > legacy_result.modernization_score
+    
+    def test_analyze_df_matches_analyze(self):
+        """Column-wise input should give the same analysis as ResourceMetrics."""
+        columns = {
+            "resource_id": ["rds-1", "ec2-1", "alb-1"],
+            "resource_type": ["rds", "ec2", "alb"],
+            "avg_cpu_percent": [10, 40, 5],
+            "avg_connections": [20, 150, 0],
+            "max_connections": [40, 200, 0],
+            "monthly_cost": [400, 100, 30],
+            "engine": ["mysql", "", ""],
+            "tags": [{}, {"role": "web"}, {}],
+        }
+        resources = [
+            ResourceMetrics(
+                resource_id=columns["resource_id"][i],
+                resource_type=ResourceType(columns["resource_type"][i]),
+                avg_cpu_percent=columns["avg_cpu_percent"][i],
+                avg_connections=columns["avg_connections"][i],
+                max_connections=columns["max_connections"][i],
+                monthly_cost=columns["monthly_cost"][i],
+                engine=columns["engine"][i],
+                tags=columns["tags"][i],
+            )
+            for i in range(3)
+        ]
+        
+        analyzer = ArchitectureAnalyzer()
+        
+        assert analyzer.analyze_df(columns) == analyzer.analyze(resources)
+    
+    def test_analyze_df_missing_values(self):
+        """Missing entries in a DataFrame should take the ResourceMetrics defaults."""
+        pd = pytest.importorskip("pandas")
+        frame = pd.DataFrame({
+            "resource_id": ["rds-1", "rds-2", "ec2-1", "ec2-2"],
+            "resource_type": ["rds", "rds", "ec2", "ec2"],
+            "avg_cpu_percent": [None, 15.0, 45.0, 10.0],
+            "avg_connections": [20.0, 10.0, None, 150.0],
+            "max_connections": [90.0, 20.0, 300.0, 200.0],
+            "monthly_cost": [400.0, 250.0, 120.0, None],
+            "storage_gb": pd.Series([pd.NA, 50, None, float("nan")], dtype=object),
+            "engine": ["postgresql", None, None, None],
+            "read_replicas": pd.array([None, 1, None, None], dtype="Int64"),
+            "tags": [None, None, {"role": "api"}, None],
+        })
+        resources = [
+            ResourceMetrics(
+                resource_id="rds-1", resource_type=ResourceType.RDS,
+                avg_connections=20, max_connections=90, monthly_cost=400, engine="postgresql",
+            ),
+            ResourceMetrics(
+                resource_id="rds-2", resource_type=ResourceType.RDS,
+                avg_cpu_percent=15, avg_connections=10, max_connections=20, monthly_cost=250, storage_gb=50,
+                read_replicas=1,
+            ),
+            ResourceMetrics(
+                resource_id="ec2-1", resource_type=ResourceType.EC2,
+                avg_cpu_percent=45, max_connections=300, monthly_cost=120, tags={"role": "api"},
+            ),
+            ResourceMetrics(
+                resource_id="ec2-2", resource_type=ResourceType.EC2,
+                avg_cpu_percent=10, avg_connections=150, max_connections=200,
+            ),
+        ]
+        
+        analyzer = ArchitectureAnalyzer()
+        result = analyzer.analyze_df(frame)
+        
+        assert result == analyzer.analyze(resources)
+        assert [c.resource_id for c in result.migration_candidates] == ["rds-1", "ec2-1", "ec2-2"]
+        assert all(isinstance(c.estimated_savings_monthly, float) for c in result.migration_candidates)
+        assert "1 resources have incomplete metrics - analysis may be limited" in result.warnings
 
 
 # ============================================================================